@@ -0,0 +1,19 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path):
+    # Write to a private temp file and rename it over path, so parallel renders reading or writing the same cache
+    # entry only ever see the old file or the complete new one
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name("{0}.tmp{1}-{2}".format(path.name, os.getpid(), threading.get_ident()))
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from manim import tempconfig
+
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+HEADLESS = {"renderer": "cairo", "quality": "low_quality", "write_to_movie": False, "save_last_frame": False,
+            "disable_caching": True, "preview": False, "verbosity": "ERROR", "progress_bar": "none"}
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes):
+    def register(function):
+        BENCHMARKS[name] = (function, sizes)
+        return function
+    return register
+
+
+def ring_graph(scene, n):
+    import numpy as np
+    from main import GraphNode
+
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    graph = [GraphNode(str(i), position=np.array([3 * np.cos(a), 3 * np.sin(a), 0]), radius=0.05, scale=0.1)
+             for i, a in enumerate(angles)]
+    edge_dict = {}
+    for i in range(n):
+        for step in (1, 2):
+            j = (i + step) % n
+            edge_dict[(min(i, j), max(i, j))] = graph[i].connect(graph[j])
+    return graph, edge_dict
+
+
+@benchmark("graph_build", [50, 200, 800])
+def graph_build(scene, n):
+    graph, edge_dict = ring_graph(scene, n)
+    scene.make_graph_mobject(graph, edge_dict)
+
+
+@benchmark("highlight", [50, 200, 800])
+def highlight(scene, n):
+    graph, edge_dict = ring_graph(scene, n)
+    start = time.perf_counter()
+    for u, v in edge_dict:
+        scene.sharpie_edge(edge_dict, u, v, animate=False)
+    for i in range(n):
+        scene.highlight_node(graph, i, animate=False)
+    return time.perf_counter() - start
+
+
+@benchmark("blink_animation", [10, 60, 300])
+def blink_animation(scene, duration):
+    from manim import Dot
+
+    animation = scene.create_animation(Dot(), duration, 0.1)
+    animation.begin()
+    for frame in range(100):
+        animation.interpolate(frame / 99)
+
+
+@benchmark("from_networkx", [20, 100, 400])
+def from_networkx(scene, n):
+    import networkx as nx
+    from manim import Graph
+
+    Graph.from_networkx(nx.erdos_renyi_graph(n, min(1.0, 4 / n), seed=0), layout="spring",
+                        layout_config={"seed": 0})
+
+
+def render_frames(scene_name, frames):
+    from manim.utils.exceptions import EndSceneEarlyException
+    import main
+
+    scene = getattr(main, scene_name)()
+    # The frame pipeline's render path calls its own add_frame, which no limiter on the renderer would see
+    scene.pipelined = False
+    setup = scene.setup
+    count = [0]
+
+    def limited_setup():
+        setup()
+        # Installed after setup, on top of whatever add_frame the scene's hooks put in place
+        add_frame = scene.renderer.add_frame
+
+        def limited_add_frame(frame, num_frames=1):
+            # A frozen wait is one call covering many frames; cap it so every scene renders the same count
+            num_frames = min(num_frames, frames - count[0])
+            add_frame(frame, num_frames)
+            count[0] += num_frames
+            if count[0] >= frames:
+                raise EndSceneEarlyException()
+
+        scene.renderer.add_frame = limited_add_frame
+
+    scene.setup = limited_setup
+    start = time.perf_counter()
+    scene.render()
+    return time.perf_counter() - start, count[0]
+
+
+def measure(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        inner = function()
+        times.append(inner if isinstance(inner, float) else time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def run(selected=None, repeat=3, frames=30, scenes=None):
+    from main import EPISODE, Kuramoto
+
+    results = {}
+    with tempconfig(HEADLESS):
+        # A Kuramoto instance has every GraphScene helper plus create_animation, and is never rendered here
+        scene = Kuramoto()
+        for name, (function, sizes) in BENCHMARKS.items():
+            if selected and name not in selected:
+                continue
+            for size in sizes:
+                key = "{0}[{1}]".format(name, size)
+                results[key] = measure(lambda: function(scene, size), repeat)
+                print("{0:<28} {1:>10.4f}s".format(key, results[key]["min"]), flush=True)
+        if not selected or "render" in selected:
+            for scene_name in scenes or EPISODE:
+                key = "render[{0},{1}f]".format(scene_name, frames)
+                try:
+                    results[key] = measure(lambda: render_frames(scene_name, frames)[0], 1)
+                except Exception as error:
+                    results[key] = {"error": repr(error)}
+                    print("{0:<28} {1}".format(key, results[key]["error"]), flush=True)
+                    continue
+                print("{0:<28} {1:>10.4f}s".format(key, results[key]["min"]), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get("results", {}).get(key)
+        if not before or "min" not in before or "min" not in result:
+            continue
+        ratio = result["min"] / before["min"] if before["min"] else float("inf")
+        result["baseline_min"] = before["min"]
+        result["ratio"] = ratio
+        if ratio > threshold:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Cairo benchmarks for the graph scenes")
+    parser.add_argument("benchmarks", nargs="*", help="subset of: {0}, render".format(", ".join(BENCHMARKS)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--scenes", nargs="*", help="scenes for the render benchmark (default: main.EPISODE)")
+    parser.add_argument("-o", "--output", default=str(HERE / "bench_results.json"))
+    parser.add_argument("--baseline", default=str(HERE / "bench_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+    os.chdir(HERE)
+
+    results = run(args.benchmarks, args.repeat, args.frames, args.scenes)
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if baseline_path.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.threshold)
+    report = {"python": platform.python_version(), "machine": platform.machine(),
+              "quality": HEADLESS["quality"], "results": results,
+              "regressions": [{"benchmark": key, "ratio": ratio} for key, ratio in regressions]}
+    Path(args.output).write_text(json.dumps(report, indent=1))
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=1))
+        print("baseline saved to {0}".format(baseline_path))
+    for key, ratio in regressions:
+        print("REGRESSION {0}: {1:.2f}x slower than baseline".format(key, ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
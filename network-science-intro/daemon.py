@@ -0,0 +1,164 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+from render import QUALITY_DIRS, STILL_SCENES, manim_quality
+
+
+HERE = Path(__file__).resolve().parent
+ADDRESS = os.environ.get("RENDER_DAEMON_SOCKET", str(HERE / ".render-daemon.sock"))
+KEY_FILE = Path(ADDRESS + ".key")
+# Config the scene hooks change in place: coalescing turns caching off, segment fingerprints raise the cache size
+JOB_CONFIG = ("disable_caching", "max_files_cached")
+
+
+class RenderDaemon:
+    def __init__(self, module_name="main"):
+        sys.path.insert(0, str(HERE))
+        self.module_name = module_name
+        self.mtimes = {}
+        self.module = importlib.import_module(module_name)
+        self.snapshot()
+        self.warm()
+
+    def local_modules(self):
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None)
+            if module.__name__ != "__main__" and path and Path(path).resolve().parent == HERE:
+                yield module
+
+    def snapshot(self):
+        self.mtimes = {module.__name__: os.stat(module.__file__).st_mtime_ns for module in self.local_modules()}
+
+    def reload(self):
+        changed = [module for module in self.local_modules()
+                   if os.stat(module.__file__).st_mtime_ns != self.mtimes.get(module.__name__)]
+        if not changed:
+            return []
+        # Helpers first so main.py rebinds to the fresh versions; untouched modules (and their caches) stay warm
+        for module in changed:
+            if module.__name__ != self.module_name:
+                importlib.reload(module)
+        self.module = importlib.reload(self.module)
+        self.snapshot()
+        return [module.__name__ for module in changed]
+
+    @staticmethod
+    def warm():
+        from manim import MathTex, Text, tempconfig
+
+        # First LaTeX compile and Pango font lookup are paid here instead of on the first job
+        with tempconfig({"verbosity": "ERROR"}):
+            MathTex(r"\nabla")
+            Text("warm")
+
+    def render(self, job):
+        from manim import config, tempconfig
+
+        scene = job["scene"]
+        quality = job.get("quality", "l")
+        start = time.perf_counter()
+        reloaded = self.reload()
+        cls = getattr(self.module, scene)
+        if job.get("title") is not None:
+            cls = type(scene, (cls,), {"title": job["title"]})
+        options = {
+            "quality": manim_quality(quality),
+            "media_dir": str(HERE / job.get("media_dir", "media")),
+            "input_file": str(HERE / "{0}.py".format(self.module_name)),
+            "save_last_frame": scene in STILL_SCENES,
+            "write_to_movie": scene not in STILL_SCENES,
+            "progress_bar": "none",
+        }
+        options.update(job.get("config", {}))
+        with tempconfig(options):
+            # Imported per job: a reload may have replaced the module and its cache
+            from glyph_cache import glyphs
+
+            saved = {key: config[key] for key in JOB_CONFIG}
+            # The glyph cache resolves its directory from media_dir on first use; this job's media_dir may differ
+            glyphs.directory = None
+            try:
+                instance = cls()
+                instance.render()
+                writer = instance.renderer.file_writer
+                output = writer.image_file_path if scene in STILL_SCENES else writer.movie_file_path
+            finally:
+                for key, value in saved.items():
+                    config[key] = value
+                glyphs.directory = None
+        return {"scene": scene, "returncode": 0, "seconds": round(time.perf_counter() - start, 3),
+                "output": str(output), "reloaded": reloaded}
+
+    def handle(self, job):
+        try:
+            return self.render(job)
+        except Exception:
+            return {"scene": job.get("scene"), "returncode": 1, "error": traceback.format_exc()}
+
+    def serve(self, address=ADDRESS):
+        if os.path.exists(address):
+            os.remove(address)
+        authkey = os.urandom(32)
+        KEY_FILE.write_bytes(authkey)
+        KEY_FILE.chmod(0o600)
+        # One job at a time: manim's config is process-global
+        with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+            print("render daemon listening on {0}".format(address), flush=True)
+            while True:
+                with listener.accept() as connection:
+                    job = connection.recv()
+                    if job.get("command") == "stop":
+                        connection.send({"returncode": 0})
+                        break
+                    result = self.handle(job)
+                    status = "ok" if result["returncode"] == 0 else "FAILED"
+                    print("{0:<20} {1:>8.1f}s  {2}".format(result["scene"], result.get("seconds", 0.0), status),
+                          flush=True)
+                    connection.send(result)
+        KEY_FILE.unlink()
+
+
+def request(job, address=ADDRESS):
+    with Client(address, family="AF_UNIX", authkey=KEY_FILE.read_bytes()) as connection:
+        connection.send(job)
+        return connection.recv()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm render daemon for the scenes in main.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start the daemon in the foreground")
+    commands.add_parser("stop", help="ask a running daemon to exit")
+    render = commands.add_parser("render", help="render scenes through the running daemon")
+    render.add_argument("scenes", nargs="+")
+    render.add_argument("-q", "--quality", default="l", choices=sorted(QUALITY_DIRS))
+    render.add_argument("--media-dir", default="media")
+    render.add_argument("--title", help="title for the Thumbnail scene")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        RenderDaemon().serve()
+        return 0
+    if args.command == "stop":
+        return request({"command": "stop"})["returncode"]
+    failed = False
+    for scene in args.scenes:
+        result = request({"scene": scene, "quality": args.quality, "media_dir": args.media_dir,
+                          "title": args.title})
+        if result["returncode"] != 0:
+            failed = True
+            print(result["error"], file=sys.stderr)
+            continue
+        reloaded = "  (reloaded {0})".format(", ".join(result["reloaded"])) if result["reloaded"] else ""
+        print("{0:<20} {1:>8.1f}s  {2}{3}".format(scene, result["seconds"], result["output"], reloaded))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from atomic_io import atomic_write
+
+
+GRAPH_CACHE_DIR = Path(os.environ.get("GRAPH_CACHE_DIR", Path(__file__).resolve().parent / "media" / "graphs"))
+
+
+def edge_dtype(num_nodes):
+    return np.int32 if num_nodes <= np.iinfo(np.int32).max else np.int64
+
+
+def erdos_renyi(n, p, seed=0):
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) // 2
+    if p <= 0 or total == 0:
+        return np.empty((0, 2), dtype=edge_dtype(n))
+    if p >= 1:
+        k = np.arange(total, dtype=np.int64)
+    else:
+        # Batagelj-Brandes: jump between kept pairs with geometric gaps instead of testing every pair
+        expected = total * p
+        batch = int(expected + 4 * np.sqrt(expected)) + 16
+        chunks, position = [], -1
+        while position < total:
+            positions = position + np.cumsum(rng.geometric(p, batch))
+            chunks.append(positions[positions < total])
+            position = positions[-1]
+        k = np.concatenate(chunks)
+    # Pair index k -> (w, v) with w < v, k = v(v - 1)/2 + w
+    v = ((1 + np.sqrt(1 + 8 * k.astype(float))) / 2).astype(np.int64)
+    v -= v * (v - 1) // 2 > k
+    v += (v + 1) * v // 2 <= k
+    w = k - v * (v - 1) // 2
+    return np.column_stack([w, v]).astype(edge_dtype(n))
+
+
+def barabasi_albert(n, m, seed=0):
+    if not 1 <= m < n:
+        raise ValueError("barabasi_albert needs 1 <= m < n, got m={0}, n={1}".format(m, n))
+    rng = np.random.default_rng(seed)
+    edges = np.empty(((n - m) * m, 2), dtype=np.int64)
+    # Every endpoint once per incident edge, so a uniform pick is a degree-proportional pick
+    repeated = np.empty(2 * (n - m) * m, dtype=np.int64)
+    size = 0
+    targets = np.arange(m)
+    for i, source in enumerate(range(m, n)):
+        edges[i * m:(i + 1) * m, 0] = source
+        edges[i * m:(i + 1) * m, 1] = targets
+        repeated[size:size + m] = targets
+        repeated[size + m:size + 2 * m] = source
+        size += 2 * m
+        chosen = set()
+        while len(chosen) < m:
+            chosen.update(repeated[rng.integers(0, size, m - len(chosen))].tolist())
+        targets = np.array(sorted(chosen))
+    return edges.astype(edge_dtype(n))
+
+
+def watts_strogatz(n, k, p, seed=0):
+    if k % 2 or not 0 < k < n:
+        raise ValueError("watts_strogatz needs an even k with 0 < k < n, got k={0}, n={1}".format(k, n))
+    rng = np.random.default_rng(seed)
+    u = np.repeat(np.arange(n, dtype=np.int64), k // 2)
+    v = (u + np.tile(np.arange(1, k // 2 + 1), n)) % n
+    keys = set((np.minimum(u, v) * n + np.maximum(u, v)).tolist())
+    degree = np.full(n, k)
+    for e in np.flatnonzero(rng.random(len(u)) < p):
+        a, b = int(u[e]), int(v[e])
+        if degree[a] >= n - 1:
+            continue
+        w = int(rng.integers(n))
+        while w == a or min(a, w) * n + max(a, w) in keys:
+            w = int(rng.integers(n))
+        keys.discard(min(a, b) * n + max(a, b))
+        keys.add(min(a, w) * n + max(a, w))
+        degree[b] -= 1
+        degree[w] += 1
+        v[e] = w
+    return np.column_stack([u, v]).astype(edge_dtype(n))
+
+
+def configuration_model(degrees, seed=0, simple=True):
+    degrees = np.asarray(degrees, dtype=np.int64)
+    n = len(degrees)
+    if degrees.sum() % 2:
+        raise ValueError("configuration_model needs an even degree sum, got {0}".format(degrees.sum()))
+    rng = np.random.default_rng(seed)
+    stubs = np.repeat(np.arange(n, dtype=np.int64), degrees)
+    rng.shuffle(stubs)
+    edges = stubs.reshape(-1, 2)
+    if simple:
+        # Erased configuration model: drop self-loops and collapse parallel edges
+        edges = np.sort(edges, axis=1)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        keys = np.unique(edges[:, 0] * n + edges[:, 1])
+        edges = np.column_stack([keys // n, keys % n])
+    return edges.astype(edge_dtype(n))
+
+
+GENERATORS = {
+    "erdos_renyi": erdos_renyi,
+    "barabasi_albert": barabasi_albert,
+    "watts_strogatz": watts_strogatz,
+    "configuration_model": configuration_model,
+}
+
+
+def graph_key(name, seed, params):
+    digest = hashlib.sha1(repr((name, seed)).encode())
+    for param, value in sorted(params.items()):
+        if isinstance(value, (list, tuple, np.ndarray)):
+            value = hashlib.sha1(np.ascontiguousarray(value, dtype=np.int64).tobytes()).hexdigest()
+        digest.update(repr((param, value)).encode())
+    return "{0}-{1}".format(name, digest.hexdigest()[:20])
+
+
+def generate(name, seed=0, cache_dir=None, **params):
+    path = Path(cache_dir or GRAPH_CACHE_DIR) / "{0}.npy".format(graph_key(name, seed, params))
+    if not path.exists():
+        edges = GENERATORS[name](seed=seed, **params)
+        with atomic_write(path) as f:
+            np.save(f, edges)
+    # Memory-mapped even on the first call, so a fresh build and a cache hit behave the same
+    return np.load(path, mmap_mode="r")
+
+
+def to_networkx(edges, num_nodes=None):
+    import networkx as nx
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(num_nodes if num_nodes is not None else int(np.max(edges, initial=-1)) + 1))
+    graph.add_edges_from(np.asarray(edges).tolist())
+    return graph
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+
+import manim
+from manim import MathTex, Tex, Text, ManimColor, config
+
+from atomic_io import atomic_write
+
+
+class GlyphCache:
+    def __init__(self, directory=None, max_entries=512, max_memory=256 * 2**20, max_disk=1 * 2**30):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.entries = OrderedDict()
+        self.memory = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def cache_dir(self):
+        if self.directory is None:
+            self.directory = config.get_dir("media_dir") / "glyphs"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory
+
+    @staticmethod
+    def normalize(value):
+        if hasattr(value, "body"):
+            return value.body
+        if isinstance(value, (list, tuple)):
+            return [GlyphCache.normalize(v) for v in value]
+        if isinstance(value, dict):
+            return sorted((k, GlyphCache.normalize(v)) for k, v in value.items())
+        if isinstance(value, ManimColor):
+            return value.to_hex(with_alpha=True)
+        return value
+
+    def key(self, cls, args, kwargs):
+        template = None if issubclass(cls, Text) else config.tex_template.body
+        parts = [manim.__version__, cls.__name__, template, self.normalize(list(args)), self.normalize(kwargs)]
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    @staticmethod
+    def size_of(mobject):
+        return sum(mob.points.nbytes for mob in mobject.get_family())
+
+    def remember(self, key, mobject):
+        self.entries[key] = mobject
+        self.memory += self.size_of(mobject)
+        while len(self.entries) > self.max_entries or self.memory > self.max_memory:
+            _, evicted = self.entries.popitem(last=False)
+            self.memory -= self.size_of(evicted)
+
+    def load(self, key):
+        path = self.cache_dir() / (key + ".pkl")
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                mobject = pickle.load(f)
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return mobject
+
+    def store(self, key, mobject):
+        try:
+            with atomic_write(self.cache_dir() / (key + ".pkl")) as f:
+                pickle.dump(mobject, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        self.trim_disk()
+
+    def trim_disk(self):
+        files = []
+        for path in self.cache_dir().glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Another render trimmed it between the listing and the stat
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk:
+                break
+            total -= size
+            path.unlink(missing_ok=True)
+
+    def get(self, cls, *args, **kwargs):
+        key = self.key(cls, args, kwargs)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            mobject = self.entries[key]
+        else:
+            mobject = self.load(key)
+            if mobject is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                mobject = cls(*args, **kwargs)
+                self.store(key, mobject)
+            self.remember(key, mobject)
+        return mobject.copy()
+
+    def mathtex(self, *tex_strings, **kwargs):
+        return self.get(MathTex, *tex_strings, **kwargs)
+
+    def tex(self, *tex_strings, **kwargs):
+        return self.get(Tex, *tex_strings, **kwargs)
+
+    def text(self, text, **kwargs):
+        return self.get(Text, text, **kwargs)
+
+
+glyphs = GlyphCache()
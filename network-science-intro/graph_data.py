@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class GraphData:
+    __slots__ = ("ids", "positions", "radii", "edges", "indptr", "indices")
+
+    def __init__(self, positions, edges, ids=None, radius=0.4):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+        n = len(self.positions)
+        self.ids = np.arange(n, dtype=np.int64) if ids is None else np.asarray(ids)
+        self.radii = np.broadcast_to(np.asarray(radius, dtype=np.float32), (n,))
+        self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        # CSR adjacency: neighbours of i are indices[indptr[i]:indptr[i + 1]]
+        heads = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        tails = np.concatenate([self.edges[:, 1], self.edges[:, 0]])
+        order = np.argsort(heads, kind="stable")
+        self.indices = tails[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=n), out=self.indptr[1:])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self, node=None):
+        degrees = np.diff(self.indptr)
+        return degrees if node is None else int(degrees[node])
+
+    def neighborhood(self, node, hops=1):
+        seen = {node}
+        frontier = [node]
+        for _ in range(hops):
+            reached = np.unique(np.concatenate([self.neighbors(u) for u in frontier])) if frontier else []
+            frontier = [int(v) for v in reached if v not in seen]
+            seen.update(frontier)
+        return sorted(seen)
+
+    def within(self, center, radius):
+        distance = np.linalg.norm(self.positions[:, :2] - np.asarray(center, dtype=np.float32)[:2], axis=1)
+        return np.flatnonzero(distance <= radius)
+
+    def induced_edges(self, nodes):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[nodes] = True
+        return self.edges[mask[self.edges[:, 0]] & mask[self.edges[:, 1]]]
@@ -0,0 +1,169 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from atomic_io import atomic_write
+
+
+LAYOUT_CACHE_DIR = Path(os.environ.get("LAYOUT_CACHE_DIR", Path(__file__).resolve().parent / "media" / "layouts"))
+
+
+def repulsion_exact(positions, k):
+    delta = positions[:, None, :] - positions[None, :, :]
+    dist2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+    np.fill_diagonal(dist2, np.inf)
+    return (delta * (k * k / dist2)[:, :, None]).sum(axis=1)
+
+
+def repulsion_tree(positions, k, leaf_size=8, chunk=4096):
+    # Multilevel grid (a quadtree in rank space): at each level a node feels, as point masses, the
+    # cells that are children of its parent's neighbours but not its own neighbours; only the 3x3
+    # leaf neighbourhood is summed pairwise. O(n log n) time, O(n) memory per pass.
+    n = len(positions)
+    levels = max(2, int(np.ceil(np.log(max(n / leaf_size, 1)) / np.log(4))))
+    side = 2 ** levels
+    # Cells split the nodes' x and y ranks evenly, so a few far-flung nodes can't stretch the grid
+    # and crowd everything else into one cell
+    ranks = np.empty((n, 2), dtype=np.int64)
+    for d in range(2):
+        ranks[np.argsort(positions[:, d], kind="stable"), d] = np.arange(n)
+    leaf = ranks * side // n
+    kk = k * k
+    force = np.zeros_like(positions)
+
+    block = np.stack(np.meshgrid(np.arange(6), np.arange(6), indexing="ij"), axis=-1).reshape(-1, 2) - 2
+    for level in range(2, levels + 1):
+        size = 2 ** level
+        xy = leaf >> (levels - level)
+        cell = xy[:, 0] * size + xy[:, 1]
+        mass = np.bincount(cell, minlength=size * size).astype(float)
+        centroid = np.stack([np.bincount(cell, weights=positions[:, d], minlength=size * size)
+                             for d in range(2)], axis=1) / np.maximum(mass, 1)[:, None]
+        x, y = xy[:, 0], xy[:, 1]
+        base_x, base_y = (x >> 1) * 2, (y >> 1) * 2
+        for dx, dy in block:
+            other_x, other_y = base_x + dx, base_y + dy
+            valid = ((other_x >= 0) & (other_x < size) & (other_y >= 0) & (other_y < size)
+                     & ((np.abs(other_x - x) > 1) | (np.abs(other_y - y) > 1)))
+            nodes = np.flatnonzero(valid)
+            index = other_x[nodes] * size + other_y[nodes]
+            delta = positions[nodes] - centroid[index]
+            dist2 = np.maximum(np.einsum("ij,ij->i", delta, delta), 1e-6)
+            force[nodes] += delta * (mass[index] * kk / dist2)[:, None]
+
+    # Near field: exact over the leaf cell and its 8 neighbours, members padded into a table
+    cell = leaf[:, 0] * side + leaf[:, 1]
+    order = np.argsort(cell, kind="stable")
+    bounds = np.searchsorted(cell[order], np.arange(side * side + 1))
+    counts = np.diff(bounds)
+    table = np.full((side * side, max(int(counts.max()), 1)), -1, dtype=np.int64)
+    slot = np.arange(n) - bounds[cell[order]]
+    table[cell[order], slot] = order
+    step = max(1, chunk * 64 // table.shape[1])
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            other_x, other_y = leaf[:, 0] + dx, leaf[:, 1] + dy
+            valid = (other_x >= 0) & (other_x < side) & (other_y >= 0) & (other_y < side)
+            for start in range(0, n, step):
+                nodes = np.flatnonzero(valid[start:start + step]) + start
+                members = table[other_x[nodes] * side + other_y[nodes]]
+                delta = positions[nodes, None, :] - positions[np.maximum(members, 0)]
+                dist2 = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 1e-6)
+                weight = np.where((members >= 0) & (members != nodes[:, None]), kk / dist2, 0)
+                force[nodes] += (delta * weight[:, :, None]).sum(axis=1)
+    return force
+
+
+def relax(positions, edges, k, iterations, temperature, cooling=0.0, pinned=None, exact_threshold=600):
+    num_nodes = len(positions)
+    for _ in range(iterations):
+        if num_nodes <= exact_threshold:
+            force = repulsion_exact(positions, k)
+        else:
+            force = repulsion_tree(positions, k)
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        distance = np.linalg.norm(delta, axis=1, keepdims=True)
+        pull = delta * distance / k
+        np.add.at(force, edges[:, 0], -pull)
+        np.add.at(force, edges[:, 1], pull)
+        length = np.maximum(np.linalg.norm(force, axis=1, keepdims=True), 1e-9)
+        step = force / length * np.minimum(length, temperature)
+        if pinned is not None:
+            step[pinned] = 0
+        positions += step
+        temperature -= cooling
+    return positions
+
+
+def force_layout(num_nodes, edges, initial=None, fixed=None, iterations=None, seed=0, scale=1.0,
+                 exact_threshold=600):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if num_nodes == 0:
+        return np.zeros((0, 3))
+    rng = np.random.default_rng(seed)
+    k = 1 / np.sqrt(max(num_nodes, 1))
+
+    positions = rng.uniform(-0.5, 0.5, (num_nodes, 2))
+    temperature = 0.1
+    if initial is not None:
+        # Warm start: known nodes keep their place, new ones start beside their placed neighbours
+        known = np.zeros(num_nodes, dtype=bool)
+        for node, position in initial.items():
+            positions[node] = np.asarray(position, dtype=float)[:2]
+            known[node] = True
+        if known.any():
+            span = np.abs(positions[known]).max() or 1
+            positions[known] /= span * 2
+            for u, v in edges:
+                if known[u] and not known[v]:
+                    positions[v] = positions[u] + rng.normal(0, k / 4, 2)
+                elif known[v] and not known[u]:
+                    positions[u] = positions[v] + rng.normal(0, k / 4, 2)
+            temperature = 0.02
+    if iterations is None:
+        iterations = 50 if initial is not None else 200
+
+    pinned = np.zeros(num_nodes, dtype=bool)
+    if fixed is not None:
+        pinned[list(fixed)] = True
+    positions = relax(positions, edges, k, iterations, temperature, temperature / (iterations + 1),
+                      pinned, exact_threshold)
+
+    positions -= positions.mean(axis=0)
+    extent = np.abs(positions).max()
+    if extent > 0:
+        positions *= scale / extent
+    return np.column_stack([positions, np.zeros(num_nodes)])
+
+
+def layout_key(num_nodes, edges, params):
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    digest = hashlib.sha1(np.int64(num_nodes).tobytes() + edges.tobytes())
+    for name, value in sorted(params.items()):
+        if isinstance(value, dict):
+            value = sorted((node, np.asarray(p, dtype=float).round(9).tolist()) for node, p in value.items())
+        digest.update(repr((name, value)).encode())
+    return digest.hexdigest()
+
+
+def cached_layout(num_nodes, edges, cache_dir=None, **params):
+    path = Path(cache_dir or LAYOUT_CACHE_DIR) / "{0}.npy".format(layout_key(num_nodes, edges, params))
+    if path.exists():
+        return np.load(path)
+    positions = force_layout(num_nodes, edges, **params)
+    with atomic_write(path) as f:
+        np.save(f, positions)
+    return positions
+
+
+def networkx_layout(graph, initial=None, **params):
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = [(index[u], index[v]) for u, v in graph.edges()]
+    if initial is not None:
+        initial = {index[node]: position for node, position in initial.items() if node in index}
+    positions = cached_layout(len(nodes), edges, initial=initial, **params)
+    return {node: positions[i] for i, node in enumerate(nodes)}
@@ -1,32 +1,329 @@
+import os
+from collections.abc import Mapping
+
 from manim import *
 
-import networkx as nx
+
+from generators import generate, to_networkx
+from glyph_cache import glyphs
+from layout import networkx_layout
+from metrics import GraphMetrics
+from oscillators import KuramotoModel
+from pipeline import FramePipeline
+from profiling import SceneProfiler
+from segments import enable_segment_fingerprints
+from temporal import EdgeStream, IncrementalLayout, SlidingWindow
+
+
+def trim_edges(positions, edges, start_buff, end_buff=None):
+    positions = np.asarray(positions, dtype=float)
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    if end_buff is None:
+        end_buff = start_buff
+    start_buff = np.asarray(start_buff, dtype=float)
+    end_buff = np.asarray(end_buff, dtype=float)
+    if start_buff.ndim:
+        start_buff = start_buff[edges[:, 0]]
+    if end_buff.ndim:
+        end_buff = end_buff[edges[:, 1]]
+    start = positions[edges[:, 0]]
+    end = positions[edges[:, 1]]
+    vector = end - start
+    length = np.linalg.norm(vector, axis=1, keepdims=True)
+    unit = np.divide(vector, length, out=np.zeros_like(vector), where=length > 0)
+    return start + unit * np.reshape(start_buff, (-1, 1)), end - unit * np.reshape(end_buff, (-1, 1)), unit
+
+
+def line_points(starts, ends):
+    # One cubic bezier per edge with handles at thirds, like Line does
+    t = np.array([0, 1 / 3, 2 / 3, 1]).reshape(1, 4, 1)
+    starts = np.asarray(starts, dtype=float)[:, None, :]
+    ends = np.asarray(ends, dtype=float)[:, None, :]
+    return (starts + t * (ends - starts)).reshape(-1, 3)
+
+
+def arc_points(starts, ends, angle=TAU / 4, num_components=8):
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    chord = ends - starts
+    half = np.linalg.norm(chord, axis=1, keepdims=True) / 2
+    half = np.where(half > 0, half, 1)
+    normal = np.stack([-chord[:, 1], chord[:, 0], np.zeros(len(chord))], axis=1) / (2 * half)
+    center = (starts + ends) / 2 + normal * half / np.tan(angle / 2)
+    radius = half / np.sin(abs(angle) / 2)
+    offset = starts - center
+    theta0 = np.arctan2(offset[:, 1], offset[:, 0])[:, None]
+    d_theta = angle / num_components
+    thetas = theta0 + np.arange(num_components + 1) * d_theta
+    anchors = np.stack([np.cos(thetas), np.sin(thetas), np.zeros_like(thetas)], axis=2)
+    tangents = np.stack([-np.sin(thetas), np.cos(thetas), np.zeros_like(thetas)], axis=2)
+    handle = 4 / 3 * np.tan(d_theta / 4)
+    a0, a1 = anchors[:, :-1], anchors[:, 1:]
+    h0 = a0 + handle * tangents[:, :-1]
+    h1 = a1 - handle * tangents[:, 1:]
+    points = np.stack([a0, h0, h1, a1], axis=2) * radius[:, None, None] + center[:, None, None, :]
+    points[:, 0, 0] = starts
+    points[:, -1, 3] = ends
+    return points.reshape(-1, 3)
+
+
+class EdgeBatch(VMobject):
+    def __init__(self, edges, starts, ends, unit_vectors=None, angle=None, buff=0, **kwargs):
+        super().__init__(**kwargs)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.edge_list = [tuple(edge) for edge in edges.tolist()]
+        self.edge_index = {edge: i for i, edge in enumerate(self.edge_list)}
+        self.angle = angle
+        # A per-node buff (one radius per node, as trim_edges takes) is stored per edge, from its start node
+        buff = np.asarray(buff, dtype=float)
+        self.buff = buff[edges[:, 0]] if buff.ndim else float(buff)
+        self.set_endpoints(starts, ends, unit_vectors)
+
+    def set_endpoints(self, starts, ends, unit_vectors=None):
+        self.starts = np.asarray(starts, dtype=float)
+        self.ends = np.asarray(ends, dtype=float)
+        if unit_vectors is None:
+            vector = self.ends - self.starts
+            length = np.linalg.norm(vector, axis=1, keepdims=True)
+            unit_vectors = np.divide(vector, length, out=np.zeros_like(vector), where=length > 0)
+        self.unit_vectors = unit_vectors
+        if self.angle is None:
+            points = line_points(self.starts, self.ends)
+        else:
+            points = arc_points(self.starts, self.ends, self.angle)
+        self.set_points(points if len(points) else np.zeros((0, 3)))
+        return self
+
+    def __len__(self):
+        return len(self.edge_list)
+
+    def __contains__(self, edge):
+        return tuple(edge) in self.edge_index
+
+    def get_edge_index(self, u, v):
+        if (u, v) in self.edge_index:
+            return self.edge_index[(u, v)], False
+        return self.edge_index[(v, u)], True
+
+    def get_edge(self, u, v):
+        i, switch = self.get_edge_index(u, v)
+        if self.angle is None:
+            line = Line(self.starts[i], self.ends[i])
+        else:
+            line = ArcBetweenPoints(self.starts[i], self.ends[i], angle=self.angle)
+        line.unit_vector = self.unit_vectors[i]
+        line.buff = self.buff[i] if np.ndim(self.buff) else self.buff
+        line.match_style(self)
+        return line
 
 
+# Filled triangle pointing along +x with its tip at the origin, unit length and width like Arrow's default tip
+TIP_TEMPLATE = line_points([[0, 0, 0], [-1, 0.5, 0], [-1, -0.5, 0]], [[-1, 0.5, 0], [-1, -0.5, 0], [0, 0, 0]])
+
+
+class ArrowBatch(EdgeBatch):
+    def __init__(self, edges, starts, ends, unit_vectors=None, buff=0, arrow_buff=MED_SMALL_BUFF,
+                 tip_length=DEFAULT_ARROW_TIP_LENGTH, max_tip_length_to_length_ratio=0.25, **kwargs):
+        self.arrow_buff = arrow_buff
+        self.tip_length = tip_length
+        self.max_tip_length_to_length_ratio = max_tip_length_to_length_ratio
+        self.tips = VMobject(fill_opacity=1)
+        super().__init__(edges, starts, ends, unit_vectors, buff=buff, **kwargs)
+        self.add(self.tips)
+
+    def set_endpoints(self, starts, ends, unit_vectors=None):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        vector = ends - starts
+        length = np.linalg.norm(vector, axis=1, keepdims=True)
+        if unit_vectors is None:
+            unit_vectors = np.divide(vector, length, out=np.zeros_like(vector), where=length > 0)
+        # Same trimming as Arrow: its own buff at both ends, then the shaft stops at the tip's base
+        starts = starts + unit_vectors * self.arrow_buff
+        self.tip_points = ends - unit_vectors * self.arrow_buff
+        self.tip_lengths = np.minimum(self.tip_length, self.max_tip_length_to_length_ratio
+                                      * np.maximum(length[:, 0] - 2 * self.arrow_buff, 0))
+        super().set_endpoints(starts, self.tip_points - unit_vectors * self.tip_lengths[:, None], unit_vectors)
+        self.tips.set_points(self.stamp_tips() if len(starts) else np.zeros((0, 3)))
+        return self
+
+    def stamp_tips(self):
+        # One shared template, rotated onto each edge direction, scaled to its tip length and moved to its end
+        x = TIP_TEMPLATE[None, :, 0] * self.tip_lengths[:, None]
+        y = TIP_TEMPLATE[None, :, 1] * self.tip_lengths[:, None]
+        ux, uy = self.unit_vectors[:, 0, None], self.unit_vectors[:, 1, None]
+        points = self.tip_points[:, None, :]
+        return np.stack([points[..., 0] + ux * x - uy * y, points[..., 1] + uy * x + ux * y,
+                         np.broadcast_to(points[..., 2], x.shape)], axis=2).reshape(-1, 3)
+
+    def overlay(self, i):
+        shaft = VMobject().set_points(self.points[4 * i:4 * i + 4])
+        tip = VMobject().set_points(self.tips.points[len(TIP_TEMPLATE) * i:len(TIP_TEMPLATE) * (i + 1)])
+        shaft.add(tip)
+        shaft.match_style(self)
+        shaft.unit_vector = self.unit_vectors[i]
+        shaft.buff = self.buff[i] if np.ndim(self.buff) else self.buff
+        return shaft
+
+    def get_edge(self, u, v):
+        return self.overlay(self.get_edge_index(u, v)[0])
+
+
+def circle_template(num_components=8):
+    thetas = np.linspace(0, TAU, num_components + 1)
+    anchors = np.stack([np.cos(thetas), np.sin(thetas), np.zeros_like(thetas)], axis=1)
+    tangents = np.stack([-np.sin(thetas), np.cos(thetas), np.zeros_like(thetas)], axis=1)
+    handle = 4 / 3 * np.tan(TAU / num_components / 4)
+    a0, a1 = anchors[:-1], anchors[1:]
+    return np.stack([a0, a0 + handle * tangents[:-1], a1 - handle * tangents[1:], a1], axis=1).reshape(-1, 3)
+
+
+class NodeCollection(VGroup):
+    def __init__(self, positions, radius=0.4, color=WHITE, opacity=1.0, palette=None, levels=16,
+                 stroke_color=None, stroke_width=2, num_components=8, **kwargs):
+        super().__init__(**kwargs)
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        n = len(self.positions)
+        self.radii = np.broadcast_to(np.asarray(radius, dtype=float), (n,)).copy()
+        self.palette = [ManimColor(c) for c in (palette or [color])]
+        self.color_indices = np.zeros(n, dtype=int)
+        self.opacities = np.broadcast_to(np.asarray(opacity, dtype=float), (n,)).copy()
+        self.levels = levels
+        self.template = circle_template(num_components)
+
+        # One VMobject per (palette colour, opacity level), each holding many circle subpaths
+        self.layers = {}
+        for c, palette_color in enumerate(self.palette):
+            for level in range(1, levels + 1):
+                layer = VMobject(fill_color=palette_color, fill_opacity=level / levels, stroke_width=0)
+                self.layers[(c, level)] = layer
+                self.add(layer)
+        self.outline = VMobject(fill_opacity=0, stroke_color=stroke_color or WHITE,
+                                stroke_width=stroke_width if stroke_color is not None else 0)
+        self.add(self.outline)
+        self.refresh()
+
+    @classmethod
+    def from_layout(cls, layout, nodes=None, **kwargs):
+        nodes = list(layout) if nodes is None else list(nodes)
+        positions = np.array([np.append(np.asarray(layout[node], dtype=float), [0, 0, 0])[:3] for node in nodes])
+        collection = cls(positions, **kwargs)
+        collection.nodes = nodes
+        collection.index = {node: i for i, node in enumerate(nodes)}
+        return collection
+
+    def __len__(self):
+        return len(self.positions)
+
+    def circle_points(self, indices=None):
+        if indices is None:
+            indices = slice(None)
+        points = self.template[None] * self.radii[indices, None, None] + self.positions[indices, None, :]
+        return points.reshape(-1, 3)
+
+    def refresh(self):
+        levels = np.clip(np.rint(self.opacities * self.levels), 0, self.levels).astype(int)
+        keys = self.color_indices * (self.levels + 1) + levels
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bounds = np.searchsorted(sorted_keys, np.arange(len(self.palette) * (self.levels + 1) + 1))
+        for (c, level), layer in self.layers.items():
+            key = c * (self.levels + 1) + level
+            members = order[bounds[key]:bounds[key + 1]]
+            layer.set_points(self.circle_points(members) if len(members) else np.zeros((0, 3)))
+        if self.outline.get_stroke_width() > 0:
+            self.outline.set_points(self.circle_points())
+        return self
+
+    def set_detail(self, num_components, refresh=True):
+        self.template = circle_template(num_components)
+        return self.refresh() if refresh else self
+
+    def set_opacities(self, opacities, refresh=True):
+        self.opacities[:] = opacities
+        return self.refresh() if refresh else self
+
+    def set_color_indices(self, indices, refresh=True):
+        self.color_indices[:] = indices
+        return self.refresh() if refresh else self
+
+    def set_positions(self, positions, refresh=True):
+        self.positions[:] = positions
+        return self.refresh() if refresh else self
+
+    def get_node_center(self, index):
+        return self.positions[index].copy()
+
+
+class DegreeHistogram(VGroup):
+    def __init__(self, model, max_degree=20, bar_width=0.2, count_height=0.05, color=BLUE_D, **kwargs):
+        super().__init__(**kwargs)
+        self.max_degree = max_degree
+        self.bar_width = bar_width
+        self.count_height = count_height
+        self.counts = np.zeros(max_degree + 1, dtype=int)
+        for degree in range(max_degree + 1):
+            self.add(Rectangle(width=bar_width, height=1, fill_color=color, fill_opacity=0.8, stroke_width=0))
+        for degree, count in model.degree_histogram.items():
+            self.counts[min(degree, max_degree)] += count
+        for degree in range(max_degree + 1):
+            self.set_bar(degree)
+        model.subscribe(self.on_change)
+
+    def set_bar(self, degree):
+        left = self.bar_width * degree
+        height = self.counts[degree] * self.count_height
+        self[degree].set_points_as_corners([[left, 0, 0], [left + self.bar_width, 0, 0],
+                                            [left + self.bar_width, height, 0], [left, height, 0], [left, 0, 0]])
+
+    def on_change(self, model, event):
+        # Only the bins whose counts moved are redrawn
+        changed = set()
+        for old, new in event["shifts"]:
+            if old is not None:
+                self.counts[min(old, self.max_degree)] -= 1
+                changed.add(min(old, self.max_degree))
+            self.counts[min(new, self.max_degree)] += 1
+            changed.add(min(new, self.max_degree))
+        for degree in changed:
+            self.set_bar(degree)
 
 
 class GraphNode:
+    __slots__ = ("char", "scale", "neighbors", "center", "radius", "drawn", "marked", "edges", "prev",
+                 "_data", "_circle")
+
     def __init__(self, data, position=ORIGIN, radius=0.5, neighbors=[], scale=1):
         self.char = data
-        self.data = Text(str(data))
-        self.data.scale(scale)
+        self.scale = scale
         self.neighbors = []
         self.center = position
         self.radius = radius
-        self.circle = Circle(radius=radius)
-        self.circle.move_to(position)
-        self.data.move_to(position)
         self.drawn = False
         self.marked = False
         self.edges = []
         self.prev = None
+        self._data = None
+        self._circle = None
+
+    # The label and circle are only built once something draws or measures them
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = Text(str(self.char))
+            self._data.scale(self.scale)
+            self._data.move_to(self.center)
+        return self._data
+
+    @property
+    def circle(self):
+        if self._circle is None:
+            self._circle = Circle(radius=self.radius)
+            self._circle.move_to(self.center)
+        return self._circle
 
     def connect(self, other):
-        line_center = Line(self.center, other.center)
-        unit_vector = line_center.get_unit_vector()
-        start, end = line_center.get_start_and_end()
-        new_start = start + unit_vector * self.radius
-        new_end = end - unit_vector * self.radius
+        (new_start,), (new_end,), _ = trim_edges([self.center, other.center], [(0, 1)], self.radius)
         line = Line(new_start, new_end)
         self.neighbors.append(other)
         other.neighbors.append(self)
@@ -35,23 +332,17 @@ class GraphNode:
         return line
 
     def connect_arrow(self, other):
-        line_center = Line(self.center, other.center)
-        unit_vector = line_center.get_unit_vector()
-        start, end = line_center.get_start_and_end()
-        new_start = start + unit_vector * self.radius / 2
-        new_end = end - unit_vector * self.radius / 2
-        arrow = Arrow(new_start, new_end)
-        arrow.buff = self.radius / 2
+        (new_start,), (new_end,), (unit_vector,) = trim_edges([self.center, other.center], [(0, 1)],
+                                                             self.radius / 2)
+        arrow = ArrowBatch([(0, 1)], [new_start], [new_end], [unit_vector], buff=self.radius / 2)
         arrow.unit_vector = unit_vector
         self.neighbors.append(other)
         self.edges.append(arrow)
         return arrow
 
     def connect_curve(self, counter_clock_adj_self, other, clockwise_adj_other, angle=TAU / 4):
-        line_self = Line(counter_clock_adj_self.circle.get_center(), self.circle.get_center())
-        unit_vector_self = line_self.get_unit_vector()
-        line_other = Line(clockwise_adj_other.circle.get_center(), other.circle.get_center())
-        unit_vector_other = line_other.get_unit_vector()
+        unit_vector_self = normalize(self.circle.get_center() - counter_clock_adj_self.circle.get_center())
+        unit_vector_other = normalize(other.circle.get_center() - clockwise_adj_other.circle.get_center())
         curve_start = self.circle.get_center() + unit_vector_self * self.radius
         curve_end = other.circle.get_center() + unit_vector_other * self.radius
         line = ArcBetweenPoints(curve_start, curve_end, angle=angle)
@@ -67,7 +358,311 @@ class GraphNode:
         return 'GraphNode({0})'.format(self.char)
 
 
+class LazyEdgeDict(Mapping):
+    def __init__(self, positions, edges, radii, directed=False):
+        self.positions = positions
+        self.radii = radii
+        self.directed = directed
+        self.edge_keys = [tuple(edge) for edge in np.asarray(edges).reshape(-1, 2).tolist()]
+        self.index = {edge: i for i, edge in enumerate(self.edge_keys)}
+        self.built = {}
+        self._arrows = None
+
+    @property
+    def arrows(self):
+        # Directed edges are stamped once as a batch; single edges are overlays of it, never full Arrows
+        if self._arrows is None:
+            buff = self.radii / 2
+            starts, ends, unit_vectors = trim_edges(self.positions, self.edge_keys, buff)
+            self._arrows = ArrowBatch(self.edge_keys, starts, ends, unit_vectors, buff=buff)
+        return self._arrows
+
+    def __getitem__(self, key):
+        if key not in self.built:
+            i = self.index[key]
+            if self.directed:
+                self.built[key] = self.arrows.overlay(i)
+                return self.built[key]
+            u, v = self.edge_keys[i]
+            (start,), (end,), (unit_vector,) = trim_edges(self.positions, [(u, v)], self.radii)
+            edge = Line(start, end)
+            edge.unit_vector = unit_vector
+            edge.buff = self.radii[u] if np.ndim(self.radii) else self.radii
+            self.built[key] = edge
+        return self.built[key]
+
+    def __iter__(self):
+        return iter(self.edge_keys)
+
+    def __len__(self):
+        return len(self.edge_keys)
+
+
+class GraphView:
+    def __init__(self, data, scale=0.9):
+        self.data = data
+        self.scale = scale
+        self.nodes = {}
+
+    def node(self, i):
+        if i not in self.nodes:
+            self.nodes[i] = GraphNode(self.data.ids[i], position=self.data.positions[i].astype(float),
+                                      radius=float(self.data.radii[i]), scale=self.scale)
+        return self.nodes[i]
+
+    def materialize(self, nodes, directed=False):
+        # GraphScene-ready (graph, edge_dict) for just these nodes, indexed locally from 0
+        nodes = [int(i) for i in nodes]
+        local = {i: j for j, i in enumerate(nodes)}
+        graph = [self.node(i) for i in nodes]
+        for node in graph:
+            node.neighbors = []
+        edges = self.data.induced_edges(nodes)
+        pairs = [(local[u], local[v]) if directed or local[u] < local[v] else (local[v], local[u])
+                 for u, v in edges.tolist()]
+        for u, v in pairs:
+            graph[u].neighbors.append(graph[v])
+            if not directed:
+                graph[v].neighbors.append(graph[u])
+        positions = self.data.positions[nodes].astype(float)
+        radii = self.data.radii[nodes].astype(float)
+        return graph, LazyEdgeDict(positions, pairs, radii, directed=directed)
+
+    def neighborhood(self, node, hops=1, directed=False):
+        return self.materialize(self.data.neighborhood(node, hops), directed=directed)
+
+
+class BlinkTrain(Animation):
+    def __init__(self, mobject, period, duty_cycle=0.5, phase=0.0, delay=0.0, cycles=None,
+                 on_opacity=1.0, off_opacity=0.0, **kwargs):
+        self.period = period
+        self.duty_cycle = duty_cycle
+        self.phase = phase
+        self.delay = delay
+        self.cycles = cycles
+        self.on_opacity = on_opacity
+        self.off_opacity = off_opacity
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(mobject, **kwargs)
+
+    def opacity_at(self, t):
+        # A train of zero blinks never touches the mobject, like the empty Succession it replaced
+        if t < self.delay or self.cycles == 0:
+            return None
+        cycle = (t - self.delay) / self.period + self.phase
+        if self.cycles is not None and cycle - self.phase >= self.cycles:
+            return self.off_opacity
+        return self.on_opacity if cycle % 1 < self.duty_cycle else self.off_opacity
+
+    def interpolate_mobject(self, alpha):
+        opacity = self.opacity_at(alpha * self.run_time)
+        if opacity is not None:
+            self.mobject.set_opacity(opacity)
+
+
+class GraphMorph(Animation):
+    def __init__(self, graph, target, **kwargs):
+        self.graph = graph
+        self.target = target
+        common = [v for v in graph.vertices if v in target.vertices]
+        gone = [v for v in graph.vertices if v not in target.vertices]
+        new = [v for v in target.vertices if v not in graph.vertices]
+        ids = common + gone + new
+        index = {v: i for i, v in enumerate(ids)}
+        self.vertices = [graph[v].copy() for v in common + gone] + [target[v].copy() for v in new]
+        self.start = np.array([graph[v].get_center() for v in common + gone] +
+                              [target[v].get_center() for v in new])
+        self.end = np.array([target[v].get_center() for v in common] +
+                            [graph[v].get_center() for v in gone] +
+                            [target[v].get_center() for v in new])
+        self.gone = self.vertices[len(common):len(common) + len(gone)]
+        self.new = self.vertices[len(common) + len(gone):]
+        # Matched vertices whose size, colour or label changes morph member by member, aligned the way
+        # Transform does; the rest only translate
+        self.morphs = []
+        moving = []
+        for i, v in enumerate(common):
+            source, goal = graph[v].copy(), target[v].copy()
+            source.align_data(goal)
+            self.vertices[i] = source.copy()
+            if self.restyled(source, goal, self.end[i] - self.start[i]):
+                self.morphs.extend(zip(*(mob.family_members_with_points()
+                                         for mob in (self.vertices[i], source, goal))))
+            else:
+                moving.append(i)
+        # Translating vertices share one point buffer: each member's points become a view into it, so a
+        # frame moves all of them with a single vectorized update
+        members = [(sub, i) for i in moving for sub in self.vertices[i].family_members_with_points()]
+        lengths = [len(sub.points) for sub, _ in members]
+        self.base = np.concatenate([sub.points for sub, _ in members]) if members else np.zeros((0, 3))
+        self.shift = np.repeat((self.end - self.start)[[i for _, i in members]], lengths, axis=0)
+        self.points = self.base.copy()
+        for (sub, _), stop, length in zip(members, np.cumsum(lengths), lengths):
+            sub.points = self.points[stop - length:stop]
+
+        def has_edge(g, u, v):
+            return (u, v) in g.edges or (not isinstance(g, DiGraph) and (v, u) in g.edges)
+
+        edges = {"common": [], "gone": [], "new": []}
+        for u, v in graph.edges:
+            edges["common" if has_edge(target, u, v) else "gone"].append((index[u], index[v]))
+        for u, v in target.edges:
+            if not has_edge(graph, u, v):
+                edges["new"].append((index[u], index[v]))
+        self.edge_batches = {}
+        for key, source in (("common", graph), ("gone", graph), ("new", target)):
+            style = next(iter(source.edges.values()), None)
+            pairs = np.array(edges[key], dtype=int).reshape(-1, 2)
+            batch = EdgeBatch(pairs, self.start[pairs[:, 0]], self.start[pairs[:, 1]])
+            if style is not None:
+                batch.set_stroke(style.get_stroke_color(), style.get_stroke_width())
+            self.edge_batches[key] = batch
+        self.pairs = {key: np.array(edges[key], dtype=int).reshape(-1, 2) for key in edges}
+        super().__init__(Group(*self.edge_batches.values(), *self.vertices), **kwargs)
+
+    @staticmethod
+    def restyled(source, goal, shift):
+        sources, goals = source.family_members_with_points(), goal.family_members_with_points()
+        if len(sources) != len(goals):
+            return True
+        for a, b in zip(sources, goals):
+            if not isinstance(a, VMobject) or a.points.shape != b.points.shape:
+                return True
+            if not np.allclose(b.points - a.points, shift):
+                return True
+            for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width",
+                         "background_stroke_width"):
+                if not np.array_equal(getattr(a, attr), getattr(b, attr)):
+                    return True
+        return False
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+        if scene is not None:
+            scene.remove(self.graph)
+            scene.remove(*self.graph.vertices.values(), *self.graph.edges.values())
+
+    def interpolate_mobject(self, alpha):
+        positions = self.start + alpha * (self.end - self.start)
+        for mob, source, goal in self.morphs:
+            mob.interpolate(source, goal, alpha)
+        np.multiply(self.shift, alpha, out=self.points)
+        self.points += self.base
+        for mob in self.gone:
+            mob.set_opacity(1 - alpha)
+        for mob in self.new:
+            mob.set_opacity(alpha)
+        for key, batch in self.edge_batches.items():
+            pairs = self.pairs[key]
+            batch.set_endpoints(positions[pairs[:, 0]], positions[pairs[:, 1]])
+        self.edge_batches["gone"].set_stroke(opacity=1 - alpha)
+        self.edge_batches["new"].set_stroke(opacity=alpha)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.remove(self.mobject)
+        scene.add(self.target)
+
+
+class TraceAnimation(Animation):
+    def __init__(self, steps, **kwargs):
+        self.steps = steps
+        self.styles = [[(sm, sm.get_fill_opacity(), sm.get_stroke_opacity())
+                        for sm in step.family_members_with_points()] for step in steps]
+        self.shown = 0
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(Group(*steps), **kwargs)
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def begin(self):
+        for step in self.steps:
+            step.set_opacity(0)
+        self.shown = 0
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        # Only the steps crossed since the last frame are touched
+        target = min(int(alpha * len(self.steps) + 1e-9), len(self.steps))
+        for i in range(target, self.shown):
+            self.steps[i].set_opacity(0)
+        for i in range(self.shown, target):
+            for sm, fill, stroke in self.styles[i]:
+                sm.set_fill(opacity=fill, family=False)
+                sm.set_stroke(opacity=stroke, family=False)
+        self.shown = target
+
+
 class GraphScene(Scene):
+    coalesce = False
+    coalesce_max_duration = 20
+    fingerprint_segments = False
+    profile = bool(os.environ.get("GRAPHSCENE_PROFILE"))
+    profile_allocations = False
+    pipelined = bool(os.environ.get("GRAPHSCENE_PIPELINE"))
+    pipeline_buffers = 4
+
+    def setup(self):
+        super().setup()
+        if self.profile:
+            self.profiler = SceneProfiler(self, self.profile_allocations).install()
+        if self.coalesce:
+            self.enable_coalescing(self.coalesce_max_duration)
+        elif self.fingerprint_segments:
+            self.segment_tracker = enable_segment_fingerprints(self)
+        if self.pipelined:
+            # Installed last so its drain runs before any other end_animation hook closes a segment
+            self.pipeline = FramePipeline(self, self.pipeline_buffers).install()
+
+    def enable_coalescing(self, max_duration=20):
+        # Consecutive plays keep writing into one partial movie until it holds max_duration
+        # seconds, so frames are identical but the segment count drops. Per-play caching can't
+        # map onto merged segments, so it is turned off while coalescing.
+        config.disable_caching = True
+        writer = self.renderer.file_writer
+        begin_animation, end_animation = writer.begin_animation, writer.end_animation
+        segment = {"open": False, "start": 0}
+
+        def close_segment():
+            if segment["open"]:
+                end_animation(True)
+                segment["open"] = False
+
+        def coalesced_begin(allow_write=False, file_path=None):
+            if not allow_write:
+                close_segment()
+                return begin_animation(allow_write, file_path)
+            if segment["open"]:
+                writer.partial_movie_files[self.renderer.num_plays] = None
+                return
+            begin_animation(allow_write, file_path)
+            segment.update(open=True, start=self.renderer.time)
+
+        def coalesced_end(allow_write=False):
+            if not allow_write:
+                return end_animation(allow_write)
+            if self.renderer.time - segment["start"] >= max_duration:
+                close_segment()
+
+        writer.begin_animation = coalesced_begin
+        writer.end_animation = coalesced_end
+        self.close_coalesced_segment = close_segment
+
+    def tear_down(self):
+        if hasattr(self, "pipeline"):
+            self.pipeline.close()
+        if hasattr(self, "close_coalesced_segment"):
+            self.close_coalesced_segment()
+        if hasattr(self, "segment_tracker"):
+            self.segment_tracker.save()
+        if hasattr(self, "profiler"):
+            self.profiler.save()
+        super().tear_down()
+
     def blink_and_top(self, text, timer=3):
         self.play(Write(text))
         self.wait(2)
@@ -110,6 +705,23 @@ class GraphScene(Scene):
 
         return graph, edges
 
+    def make_edges(self, positions, edges, radius=0.5, directed=False, angle=None):
+        buff = np.asarray(radius, dtype=float) / 2 if directed else radius
+        starts, ends, unit_vectors = trim_edges(positions, edges, buff)
+        if directed and angle is None:
+            return ArrowBatch(edges, starts, ends, unit_vectors, buff=buff)
+        return EdgeBatch(edges, starts, ends, unit_vectors, angle=angle, buff=buff)
+
+    def connect_nodes(self, graph, edges, directed=False, angle=None):
+        positions = np.array([node.center for node in graph])
+        radii = np.array([node.radius for node in graph])
+        batch = self.make_edges(positions, edges, radius=radii, directed=directed, angle=angle)
+        for u, v in batch.edge_list:
+            graph[u].neighbors.append(graph[v])
+            if not directed:
+                graph[v].neighbors.append(graph[u])
+        return batch
+
     def make_graph_mobject(self, graph, edge_dict, node_color=WHITE, stroke_color=WHITE, data_color=BLACK,
                            edge_color=GRAY_A, scale_factor=1):
         nodes = []
@@ -120,7 +732,8 @@ class GraphScene(Scene):
             node.data.set_color(color=data_color)
             nodes.append(VGroup(node.circle, node.data))
 
-        for edge in edge_dict.values():
+        edge_mobjects = [edge_dict] if isinstance(edge_dict, EdgeBatch) else edge_dict.values()
+        for edge in edge_mobjects:
             edge.set_stroke(width=7 * scale_factor)
             edge.set_color(color=edge_color)
             edges.append(edge)
@@ -128,13 +741,26 @@ class GraphScene(Scene):
 
     def sharpie_edge(self, edge_dict, u, v, color=PINK, scale_factor=1, animate=True, directed=False):
         switch = False
-        if u > v:
+        index = 0
+        if isinstance(edge_dict, LazyEdgeDict) and edge_dict.directed:
+            edge_dict = edge_dict.arrows
+        if isinstance(edge_dict, ArrowBatch):
+            # Arrows are directed: (v, u) is a different edge, so there is no reversed fallback
+            edge = edge_dict
+            index = edge_dict.edge_index[(u, v)]
+        elif isinstance(edge_dict, EdgeBatch):
+            i, switch = edge_dict.get_edge_index(u, v)
+            edge = edge_dict.get_edge(*edge_dict.edge_list[i])
+        elif u > v:
             edge = edge_dict[(v, u)]
             switch = True
         else:
             edge = edge_dict[(u, v)]
 
-        if not switch:
+        if isinstance(edge, ArrowBatch):
+            # Copies the batch's stamped shaft and tip instead of building a fresh Arrow
+            line = edge.overlay(index)
+        elif not switch:
             if not directed:
                 line = Line(edge.get_start(), edge.get_end())
             else:
@@ -160,9 +786,13 @@ class GraphScene(Scene):
 
     def highlight_node(self, graph, index, color=BLUE_D,
                        start_angle=TAU / 2, scale_factor=1, animate=True):
-        node = graph[index]
-        surround_circle = Circle(radius=node.circle.radius * scale_factor)
-        surround_circle.move_to(node.circle.get_center())
+        if isinstance(graph, NodeCollection):
+            radius, center = graph.radii[index], graph.get_node_center(index)
+        else:
+            node = graph[index]
+            radius, center = node.circle.radius, node.circle.get_center()
+        surround_circle = Circle(radius=radius * scale_factor)
+        surround_circle.move_to(center)
         # surround_circle.scale(1.15)
         surround_circle.set_stroke(width=8 * scale_factor)
         surround_circle.set_color(color)
@@ -173,23 +803,207 @@ class GraphScene(Scene):
             )
         return surround_circle
 
+    def trace_animation(self, graph, edge_dict, events, step_time=0.25, run_time=None,
+                        visit_color=BLUE_D, edge_color=PINK, relax_color=YELLOW):
+        steps = []
+        for event in events:
+            if event[0] == "visit":
+                _, node, prev = event
+                step = VGroup(self.highlight_node(graph, node, color=visit_color, animate=False))
+                if prev is not None:
+                    step.add(self.sharpie_edge(edge_dict, prev, node, color=edge_color, animate=False))
+            else:
+                step = self.sharpie_edge(edge_dict, event[1], event[2], color=relax_color,
+                                         scale_factor=0.5, animate=False)
+            steps.append(step)
+        return TraceAnimation(steps, run_time=run_time or step_time * max(len(steps), 1))
+
+    def pixels_per_unit(self):
+        return config.pixel_width / self.camera.frame_width
+
+    def lod_components(self, radius_px, circle_px=12):
+        # Full 8-segment circles only once a node is big enough for the facets to show
+        if radius_px >= circle_px:
+            return 8
+        return 4 if radius_px >= circle_px / 4 else 2
+
+    def apply_lod(self, graph, label_px=8, edge_px=1.0, edge_length_px=3, circle_px=12, bundle_min=64):
+        ppu = self.pixels_per_unit()
+        if isinstance(graph, NodeCollection):
+            return graph.set_detail(self.lod_components(float(np.median(graph.radii)) * ppu, circle_px))
+
+        vertices = list(graph.vertices)
+        index = {v: i for i, v in enumerate(vertices)}
+        for vertex in graph.vertices.values():
+            for label in [sm for sm in vertex.submobjects if isinstance(sm, (Text, SingleStringMathTex))]:
+                if label.height * ppu < label_px:
+                    vertex.remove(label)
+            radius = getattr(vertex, "radius", vertex.width / 2)
+            components = self.lod_components(radius * ppu, circle_px)
+            if components < 8:
+                vertex.set_points(circle_template(components) * radius + vertex.get_center())
+
+        small = []
+        for key, edge in graph.edges.items():
+            width_px = edge.get_stroke_width() * 0.01 * ppu
+            if width_px < edge_px or edge.get_length() * ppu < edge_length_px:
+                small.append(key)
+        if len(small) < bundle_min:
+            return None
+
+        # Sub-pixel edges become one path whose alpha stands in for their pixel coverage
+        style = graph.edges[small[0]]
+        width_px = style.get_stroke_width() * 0.01 * ppu
+        pairs = np.array([(index[u], index[v]) for u, v in small])
+        centers = np.array([graph[v].get_center() for v in vertices])
+        bundle = EdgeBatch(pairs, centers[pairs[:, 0]], centers[pairs[:, 1]])
+        bundle.set_stroke(style.get_stroke_color(), width=max(width_px, edge_px) / (0.01 * ppu),
+                          opacity=min(1.0, width_px / edge_px) * style.get_stroke_opacity())
+        graph.remove(*[graph.edges[key] for key in small])
+        graph.add_to_back(bundle)
+
+        bundled = set(small)
+        kept = [(index[u], index[v], edge) for (u, v), edge in graph.edges.items() if (u, v) not in bundled]
+
+        def update_edges(mob):
+            centers = np.array([mob[v].get_center() for v in vertices])
+            for u, v, edge in kept:
+                edge.put_start_and_end_on(centers[u], centers[v])
+            bundle.set_endpoints(centers[pairs[:, 0]], centers[pairs[:, 1]])
+
+        # Replaces Graph's own per-edge updater, which would keep moving the hidden Lines
+        graph.clear_updaters()
+        graph.add_updater(update_edges)
+        return bundle
+
+    def graph_metrics(self, graph):
+        return GraphMetrics.from_graph_nodes(graph)
+
+    def stack_tex(self, lines, position, direction=DOWN):
+        texs = []
+        for line in lines:
+            tex = glyphs.mathtex(line)
+            if texs:
+                tex.next_to(texs[-1], direction)
+            else:
+                tex.move_to(position)
+            texs.append(tex)
+        return texs
+
+    def growth_counter(self, model, label, getter, num_decimal_places=2):
+        number = DecimalNumber(getter(model), num_decimal_places=num_decimal_places)
+        counter = VGroup(MathTex(label), number).arrange(RIGHT)
+        model.subscribe(lambda m, event: number.set_value(getter(m)))
+        return counter
+
+    def drive_oscillators(self, model, vertices, color=None, min_opacity=0.1):
+        if isinstance(vertices, NodeCollection):
+            order = np.array([vertices.index[node] for node in model.nodes])
+
+            def set_opacities(opacities):
+                vertices.opacities[order] = opacities
+                vertices.refresh()
+        else:
+            mobjects = [vertices[node] for node in model.nodes]
+            if color is not None:
+                for mob in mobjects:
+                    mob.set_fill(color)
+
+            def set_opacities(opacities):
+                for mob, opacity in zip(mobjects, opacities.tolist()):
+                    mob.set_fill(opacity=opacity)
+
+        def update_vertices(clock, dt):
+            clock.increment_value(dt)
+            set_opacities(min_opacity + (1 - min_opacity) * model.brightness_at(clock.get_value()))
+
+        clock = ValueTracker(0)
+        clock.add_updater(update_vertices)
+        self.add(clock)
+        return clock
+
+    def order_parameter_plot(self, model, axes, clock, color=YELLOW):
+        origin = axes.c2p(0, 0)
+        x_unit = axes.c2p(1, 0) - origin
+        y_unit = axes.c2p(0, 1) - origin
+        curve = VMobject(color=color)
+
+        def update_curve(mob):
+            times, order = model.order_history(clock.get_value())
+            if len(times) > 1:
+                mob.set_points_as_corners(origin + np.outer(times, x_unit) + np.outer(order, y_unit))
+
+        curve.add_updater(update_curve)
+        return curve
+
+
+class TemporalNetworkScene(GraphScene):
+    def stream_edges(self, path, window, log_rate, duration, scale=3.5, radius=0.05,
+                     node_color=WHITE, edge_color=GRAY_A):
+        stream = EdgeStream(path)
+        contacts = SlidingWindow(window)
+        layout = IncrementalLayout()
+        template = circle_template(4) * radius
+        edges = VMobject(stroke_color=edge_color, stroke_width=1)
+        nodes = VMobject(fill_color=node_color, fill_opacity=1, stroke_width=0)
+        network = VGroup(edges, nodes)
+        network.time = 0.0
+
+        def update_network(mob, dt):
+            # Only the contacts inside the window are ever held, so memory stays flat over the log
+            mob.time += dt
+            now = stream.start_time + mob.time * log_rate
+            for t, u, v in stream.read_until(now):
+                contacts.add(t, u, v)
+            contacts.expire(now)
+            _, positions, pairs = layout.update(contacts)
+            points = np.column_stack([positions * scale, np.zeros(len(positions))])
+            edges.set_points(line_points(points[pairs[:, 0]], points[pairs[:, 1]]) if len(pairs)
+                             else np.zeros((0, 3)))
+            nodes.set_points((template[None] + points[:, None, :]).reshape(-1, 3) if len(points)
+                             else np.zeros((0, 3)))
+
+        network.add_updater(update_network)
+        self.add(network)
+        self.wait(duration)
+        network.clear_updaters()
+        stream.close()
+        return network
+
+
 class Thumbnail(Scene):
+    title = os.environ.get("THUMBNAIL_TITLE", "Redes Complexas")
+
+    @staticmethod
+    def background():
+        pink_nabla = glyphs.mathtex(r"\nabla", color='#FF90BC').scale(8).move_to(DR*0.1)
+        blue_nabla = glyphs.mathtex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5).move_to(UL*0.1)
+        return pink_nabla, blue_nabla
+
+    @staticmethod
+    def title_text(title):
+        return Text(title, color=BLACK).move_to(2.5*DOWN).scale(1.5)
+
     def construct(self):
         self.camera.background_color = WHITE
-        pink_nabla = MathTex(r"\nabla", color='#FF90BC').scale(8).move_to(DR*0.1)
-        blue_nabla = MathTex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5).move_to(UL*0.1)
-        text_input = input("Título da Thumbnail: ")
-        text = Text(text_input, color=BLACK).move_to(2.5*DOWN).scale(1.5)
+        pink_nabla, blue_nabla = self.background()
+        text = self.title_text(self.title)
         self.add(pink_nabla, blue_nabla)
         self.add(text)
 
 
-class LogoData(Scene):
-    def construct(self):
+class BrandingScene(Scene):
+    branded = True
+
+    def nablas(self):
+        pink_nabla = glyphs.mathtex(r"\nabla", color='#FF90BC').scale(8)
+        blue_nabla = glyphs.mathtex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5)
+        return pink_nabla, blue_nabla
+
+    def logo_intro(self):
         self.camera.background_color = WHITE
-        pink_nabla = MathTex(r"\nabla", color='#FF90BC').scale(8)
-        blue_nabla = MathTex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5)
-        text = Text('data', color=WHITE).move_to(2.5*DOWN).scale(2)
+        pink_nabla, blue_nabla = self.nablas()
+        text = glyphs.text('data', color=WHITE).move_to(2.5*DOWN).scale(2)
         self.play(FadeIn(pink_nabla, blue_nabla))
         # self.wait()
         self.play(
@@ -198,22 +1012,18 @@ class LogoData(Scene):
             Write(text)
         )
         self.wait()
+        return pink_nabla, blue_nabla, text
+
+
+class LogoData(BrandingScene):
+    def construct(self):
+        pink_nabla, blue_nabla, text = self.logo_intro()
         self.play(FadeOut(text, pink_nabla, blue_nabla))
 
-class DataPresentation(Scene):
+class DataPresentation(BrandingScene):
     def construct(self):
-        self.camera.background_color = WHITE
-        pink_nabla = MathTex(r"\nabla", color='#FF90BC').scale(8)
-        blue_nabla = MathTex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5)
-        text = Text('data', color=WHITE).move_to(2.5*DOWN).scale(2)
-        self.play(FadeIn(pink_nabla, blue_nabla))
-        # self.wait()
-        self.play(
-            pink_nabla.animate.move_to(DR*0.1),
-            blue_nabla.animate.move_to(UL*0.1),
-            Write(text)
-        )
-        self.wait()
+        pink_nabla, blue_nabla, text = self.logo_intro()
+        nabla = Group(pink_nabla, blue_nabla)
         self.play(FadeOut(text), nabla.animate.to_corner(UL))
 
         blist = BulletedList("Engenharia de Dados", "Ciência de Dados", "Aprendizado de Máquina", color=BLACK)
@@ -224,12 +1034,11 @@ class DataPresentation(Scene):
 
         self.play(FadeOut(blist, nabla))
 
-class FinalData(Scene):
+class FinalData(BrandingScene):
     def construct(self):
         self.camera.background_color = WHITE
-        pink_nabla = MathTex(r"\nabla", color='#FF90BC').scale(8).move_to(DR*0.1)
-        blue_nabla = MathTex(r"\nabla", color='#6bafd6').scale(8).set_opacity(0.5).move_to(UL*0.1)
-        nabla = Group(pink_nabla, blue_nabla)
+        pink_nabla, blue_nabla = self.nablas()
+        nabla = Group(pink_nabla.move_to(DR*0.1), blue_nabla.move_to(UL*0.1))
         text = Text('Obrigado por assistir!', color=BLACK).move_to(2.5*DOWN)
         # self.play(FadeIn(pink_nabla, blue_nabla))
         # self.wait()
@@ -439,10 +1248,18 @@ class TiposGrafos(GraphScene):
         self.wait(2)
 
         self.blink(Text("Grafos Direcionados"))
+        import networkx as nx
+
         nodes = [1, 2, 3, 4]
         edges = [(1, 2), (2, 3), (3, 4), (1, 3)]
 
-        g = DiGraph(nodes, edges, labels=True, layout_scale=3)
+        layout = networkx_layout(nx.DiGraph(edges), scale=3)
+        vertices = VGroup(*[LabeledDot(MathTex(str(node), color=BLACK), point=layout[node]) for node in nodes])
+        positions = np.array([layout[node] for node in nodes])
+        radii = np.array([vertex.width / 2 for vertex in vertices])
+        index = [(nodes.index(u), nodes.index(v)) for u, v in edges]
+        starts, ends, unit_vectors = trim_edges(positions, index, radii)
+        g = VGroup(ArrowBatch(index, starts, ends, unit_vectors, buff=radii, arrow_buff=0), vertices)
         self.play(FadeIn(g))
         self.wait(10)
         self.play(FadeOut(g))
@@ -471,17 +1288,16 @@ class MedidasBasicas(GraphScene):
     def grau_medio(self):
         self.blink(Text("Grau Médio"))
 
-        k0 = MathTex("k(0) = 2").move_to(RIGHT*3+UP*2)
-        k1 = MathTex("k(1) = 1").next_to(k0, DOWN)
-        k2 = MathTex("k(2) = 2").next_to(k1, DOWN)
-        k3 = MathTex("k(3) = 2").next_to(k2, DOWN)
+        graph, _ = self.create_small_graph()
+        metrics = self.graph_metrics(graph)
 
-        spl_list = [k0, k1, k2, k3]
+        spl_list = self.stack_tex(["k({0}) = {1}".format(label, k)
+                                   for label, k in zip(metrics.labels, metrics.degrees)], RIGHT*3+UP*2)
 
         for s in spl_list:
             self.play(Create(s))
 
-        avg_k = MathTex("<k> = 1.75").next_to(k3, DOWN)
+        avg_k = MathTex("<k> = {0:.2f}".format(metrics.mean_degree)).next_to(spl_list[-1], DOWN)
 
         self.wait(2)
         self.play(Write(avg_k))
@@ -504,17 +1320,18 @@ class MedidasBasicas(GraphScene):
 
         self.wait(3)
 
-        edge_list = [edge for edge in edge_dict]
-        first_edge = edge_list[1]
-        second_edge = edge_list[2]
+        metrics = self.graph_metrics(graph)
+        path = metrics.shortest_path(0, 1)
+        path_edges = list(zip(path, path[1:]))
 
-        self.sharpie_edge(edge_dict, first_edge[0], first_edge[1], animate=True)
-        self.sharpie_edge(edge_dict, second_edge[0], second_edge[1], animate=True)
+        for u, v in path_edges:
+            self.sharpie_edge(edge_dict, u, v, animate=True)
         self.wait(2)
 
-        shortest_path_eq = MathTex("S(0,1)=\{(0,2), (2,1)\}").move_to(RIGHT*3 + UP)
+        shortest_path_eq = MathTex("S(0,1)=\{" + ", ".join("({0},{1})".format(u, v) for u, v in path_edges)
+                                   + "\}").move_to(RIGHT*3 + UP)
 
-        shortest_path_length = MathTex("P(0,1) = 2").next_to(shortest_path_eq, DOWN)
+        shortest_path_length = MathTex("P(0,1) = {0}".format(len(path_edges))).next_to(shortest_path_eq, DOWN)
 
         self.play(Write(shortest_path_eq))
         self.play(Write(shortest_path_length))
@@ -526,19 +1343,13 @@ class MedidasBasicas(GraphScene):
             FadeOut(shortest_path_eq),
             FadeOut(shortest_path_length))
         
-        s01 = MathTex("P(0,1) = 2").move_to(RIGHT*3+UP*2)
-        s02 = MathTex("P( 0, 2) = 1").next_to(s01, DOWN)
-        s03 = MathTex("P( 0, 3) = 1").next_to(s02, DOWN)
-        s12 = MathTex("P( 1, 2) = 2").next_to(s03, DOWN)
-        s13 = MathTex("P( 1, 3) = 1").next_to(s12, DOWN)
-        s23 = MathTex("P( 2, 3) = 1").next_to(s13, DOWN)
-
-        spl_list = [s01, s02, s03, s12, s13, s23]
+        spl_list = self.stack_tex(["P({0}, {1}) = {2}".format(u, v, d) for u, v, d in metrics.pair_distances()],
+                                  RIGHT*3+UP*2)
 
         for s in spl_list:
             self.play(Create(s), run_time=0.5)
 
-        average_spl = MathTex("<P>=1.33...").next_to(s23, DOWN*2)
+        average_spl = MathTex("<P>={0:.2f}".format(metrics.average_path_length())).next_to(spl_list[-1], DOWN*2)
 
         self.wait(2)
         self.play(Write(average_spl))
@@ -551,7 +1362,8 @@ class MedidasBasicas(GraphScene):
     def diametro(self): 
         self.blink(Text("Diâmetro"))
         diameter_eq = MathTex("d_G = MAX(P_G(i,j))").move_to(RIGHT*3+UP)
-        diameter_result = MathTex("d_G = 2").move_to(RIGHT*3+UP)
+        graph, _ = self.create_small_graph()
+        diameter_result = MathTex("d_G = {0}".format(self.graph_metrics(graph).diameter())).move_to(RIGHT*3+UP)
         self.play(Write(diameter_eq))
         self.wait()
         self.play(ReplacementTransform(diameter_eq, diameter_result))
@@ -561,6 +1373,8 @@ class MedidasBasicas(GraphScene):
 class Kuramoto(GraphScene):
     purple = '#6532CD'
     def construct(self):
+        import networkx as nx
+
         vertices = [1, 2]
         edges = [(1, 2)]
         lt = {1: [-3, 0, 0], 2: [3, 0, 0]}
@@ -598,30 +1412,53 @@ class Kuramoto(GraphScene):
 
         vertices = [1, 2, 3, 4, 5, 6]
         edges = [(1, 2), (2, 3), (2, 4), (1, 5), (1, 6)]
-        mg = Graph(vertices, edges, vertex_config={'radius': 0.40})
-        bg = Graph.from_networkx(nx.erdos_renyi_graph(20, 0.5), layout="spring", layout_scale=3.5)
+        mg = Graph(vertices, edges, vertex_config={'radius': 0.40},
+                   layout=networkx_layout(nx.Graph(edges), scale=2))
+        er = to_networkx(generate("erdos_renyi", n=20, p=0.5, seed=0), 20)
+        bg = Graph.from_networkx(er, layout=networkx_layout(er, scale=3.5))
+        self.apply_lod(bg)
 
-        self.play(Transform(g, mg))
+        self.play(GraphMorph(g, mg))
 
         self.wait()
 
-        self.play(Transform(g, bg))
+        self.play(GraphMorph(mg, bg))
 
         self.wait()
 
+        duration = 10
+        model = KuramotoModel(er, coupling=2, seed=0, fps=config.frame_rate)
+        axes = Axes(x_range=[0, duration, 2], y_range=[0, 1, 0.5], x_length=3, y_length=1.5).to_corner(DR)
+        self.play(FadeIn(axes))
+        # The clock starts once the axes are up, so r(t) covers exactly the plotted 0..duration
+        clock = self.drive_oscillators(model, bg.vertices, color=self.purple)
+        curve = self.order_parameter_plot(model, axes, clock)
+        self.add(curve)
+        self.wait(duration)
+        clock.clear_updaters()
+        curve.clear_updaters()
 
-        self.play(FadeOut(g))
+        self.play(FadeOut(bg, axes, curve))
 
     def create_animation(self, dot, total_duration, blink_rate, delay: float = 0):
 
         dot_copy = dot.copy()
         dot_copy.color = self.purple
         num_cycles = int(total_duration // (2*blink_rate))
-        animations = []
-        animations.append(Wait(delay))
-        for _ in range(num_cycles):
-            animations.append(dot_copy.animate(run_time=0).set_opacity(1).build())
-            animations.append(Wait(blink_rate))
-            animations.append(dot_copy.animate(run_time=0).set_opacity(0).build())
-            animations.append(Wait(blink_rate))
-        return Succession(*animations, run_time=total_duration)
+        # Same timeline the old Succession produced: delay + on/off cycles, stretched to total_duration
+        length = delay + num_cycles * 2 * blink_rate
+        stretch = total_duration / length if length > 0 else 1
+        return BlinkTrain(dot_copy, period=2 * blink_rate * stretch, delay=delay * stretch,
+                          cycles=num_cycles, run_time=total_duration)
+
+
+EPISODE = [
+    "LogoData",
+    "Pergunta",
+    "BridgeText",
+    "ConceitosBasicos",
+    "TiposGrafos",
+    "MedidasBasicas",
+    "Kuramoto",
+    "FinalData",
+]
@@ -0,0 +1,259 @@
+import copy
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order
+
+
+# Least recently used graphs are evicted first, so a long-lived process (the render daemon) stays bounded
+METRICS_CACHE_SIZE = 32
+_metrics_cache = OrderedDict()
+
+
+class GraphMetrics:
+    def __init__(self, num_nodes, edges, labels=None):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.num_nodes = num_nodes
+        self.edges = edges
+        self.labels = list(labels) if labels is not None else list(range(num_nodes))
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+        adjacency = sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(num_nodes, num_nodes))
+        adjacency.data[:] = 1
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+        self.adjacency = adjacency
+        self._path_stats = {}
+
+    @staticmethod
+    def fingerprint(num_nodes, edges):
+        edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+        edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+        return num_nodes, hashlib.sha1(edges.tobytes()).hexdigest()
+
+    @classmethod
+    def cached(cls, num_nodes, edges, labels=None):
+        key = (cls, cls.fingerprint(num_nodes, edges))
+        if key in _metrics_cache:
+            _metrics_cache.move_to_end(key)
+        else:
+            _metrics_cache[key] = cls(num_nodes, edges)
+            while len(_metrics_cache) > METRICS_CACHE_SIZE:
+                _metrics_cache.popitem(last=False)
+        # Labels live on a shallow copy, which shares the adjacency and the computed path stats
+        metrics = copy.copy(_metrics_cache[key])
+        metrics.labels = list(labels) if labels is not None else list(range(num_nodes))
+        return metrics
+
+    @classmethod
+    def from_graph_nodes(cls, graph):
+        index = {id(node): i for i, node in enumerate(graph)}
+        edges = [(i, index[id(other)]) for i, node in enumerate(graph)
+                 for other in node.neighbors if i < index[id(other)]]
+        return cls.cached(len(graph), edges, [node.char for node in graph])
+
+    @classmethod
+    def from_edge_dict(cls, num_nodes, edge_dict, labels=None):
+        return cls.cached(num_nodes, list(edge_dict), labels)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(index[u], index[v]) for u, v in graph.edges()]
+        return cls.cached(len(nodes), edges, nodes)
+
+    @property
+    def degrees(self):
+        return np.diff(self.adjacency.indptr)
+
+    @property
+    def mean_degree(self):
+        return float(self.degrees.mean()) if self.num_nodes else 0.0
+
+    def shortest_path(self, u, v):
+        _, predecessors = breadth_first_order(self.adjacency, u, directed=False, return_predecessors=True)
+        if u != v and predecessors[v] < 0:
+            return None
+        path = [v]
+        while path[-1] != u:
+            path.append(predecessors[path[-1]])
+        return [int(node) for node in reversed(path)]
+
+    def distances_from(self, sources):
+        # Multi-source BFS: one sparse product advances every source's frontier at once
+        sources = np.asarray(sources, dtype=np.int64)
+        dist = np.full((len(sources), self.num_nodes), -1, dtype=np.int32)
+        dist[np.arange(len(sources)), sources] = 0
+        frontier = np.zeros((self.num_nodes, len(sources)), dtype=bool)
+        frontier[sources, np.arange(len(sources))] = True
+        visited = frontier.copy()
+        depth = 0
+        while frontier.any():
+            depth += 1
+            # int32 counts: an int8 product wraps to 0 for a node with 256 frontier neighbours
+            frontier = (self.adjacency @ frontier.astype(np.int32)) > 0
+            frontier &= ~visited
+            visited |= frontier
+            dist.T[frontier] = depth
+        return dist
+
+    def distance_matrix(self, block_size=256):
+        return np.vstack([self.distances_from(np.arange(start, min(start + block_size, self.num_nodes)))
+                          for start in range(0, self.num_nodes, block_size)])
+
+    def path_stats(self, samples=None, seed=0, block_size=256):
+        key = (samples, seed)
+        if key in self._path_stats:
+            return self._path_stats[key]
+        if samples is None or samples >= self.num_nodes:
+            sources = np.arange(self.num_nodes)
+        else:
+            sources = np.random.default_rng(seed).choice(self.num_nodes, samples, replace=False)
+        total, pairs, diameter = 0, 0, 0
+        for start in range(0, len(sources), block_size):
+            block = sources[start:start + block_size]
+            dist = self.distances_from(block)
+            reachable = dist > 0
+            total += int(dist[reachable].sum())
+            pairs += int(reachable.sum())
+            if reachable.any():
+                diameter = max(diameter, int(dist.max()))
+        stats = (total / pairs if pairs else 0.0, diameter)
+        self._path_stats[key] = stats
+        return stats
+
+    def average_path_length(self, samples=None, seed=0):
+        return self.path_stats(samples, seed)[0]
+
+    def diameter(self, samples=None, seed=0):
+        return self.path_stats(samples, seed)[1]
+
+    def pair_distances(self):
+        dist = self.distance_matrix()
+        i, j = np.triu_indices(self.num_nodes, k=1)
+        return [(self.labels[a], self.labels[b], int(dist[a, b])) for a, b in zip(i, j) if dist[a, b] >= 0]
+
+
+class GrowingGraph:
+    def __init__(self, nodes=()):
+        self.neighbors = {}
+        self.parent = {}
+        self.size = {}
+        self.triangles = {}
+        self.degree_histogram = {}
+        self.num_edges = 0
+        self.num_components = 0
+        self.total_triangles = 0
+        self.total_wedges = 0
+        self.local_clustering_sum = 0.0
+        self.subscribers = []
+        for node in nodes:
+            self.add_node(node)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def emit(self, event):
+        for callback in self.subscribers:
+            callback(self, event)
+
+    @property
+    def num_nodes(self):
+        return len(self.neighbors)
+
+    @property
+    def mean_degree(self):
+        return 2 * self.num_edges / self.num_nodes if self.num_nodes else 0.0
+
+    @property
+    def transitivity(self):
+        return 3 * self.total_triangles / self.total_wedges if self.total_wedges else 0.0
+
+    @property
+    def average_clustering(self):
+        return self.local_clustering_sum / self.num_nodes if self.num_nodes else 0.0
+
+    def degree(self, node):
+        return len(self.neighbors[node])
+
+    def local_clustering(self, node):
+        d = len(self.neighbors[node])
+        return 2 * self.triangles[node] / (d * (d - 1)) if d > 1 else 0.0
+
+    def find(self, node):
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, u, v):
+        ru, rv = self.find(u), self.find(v)
+        if ru == rv:
+            return False
+        if self.size[ru] < self.size[rv]:
+            ru, rv = rv, ru
+        self.parent[rv] = ru
+        self.size[ru] += self.size[rv]
+        self.num_components -= 1
+        return True
+
+    def shift_degree(self, old, new):
+        self.degree_histogram[old] -= 1
+        if not self.degree_histogram[old]:
+            del self.degree_histogram[old]
+        self.degree_histogram[new] = self.degree_histogram.get(new, 0) + 1
+
+    def add_node(self, node):
+        if node in self.neighbors:
+            return False
+        self.neighbors[node] = set()
+        self.parent[node] = node
+        self.size[node] = 1
+        self.triangles[node] = 0
+        self.degree_histogram[0] = self.degree_histogram.get(0, 0) + 1
+        self.num_components += 1
+        self.emit({"type": "node", "node": node, "degrees": {0: self.degree_histogram[0]},
+                   "shifts": [(None, 0)]})
+        return True
+
+    def add_edge(self, u, v):
+        if u == v:
+            return False
+        self.add_node(u)
+        self.add_node(v)
+        nu, nv = self.neighbors[u], self.neighbors[v]
+        if v in nu:
+            return False
+
+        common = nu & nv if len(nu) < len(nv) else nv & nu
+        touched = {u, v} | common
+        self.local_clustering_sum -= sum(self.local_clustering(w) for w in touched)
+
+        du, dv = len(nu), len(nv)
+        self.total_wedges += du + dv
+        self.total_triangles += len(common)
+        self.triangles[u] += len(common)
+        self.triangles[v] += len(common)
+        for w in common:
+            self.triangles[w] += 1
+        nu.add(v)
+        nv.add(u)
+        self.num_edges += 1
+        self.shift_degree(du, du + 1)
+        self.shift_degree(dv, dv + 1)
+        merged = self.union(u, v)
+
+        self.local_clustering_sum += sum(self.local_clustering(w) for w in touched)
+        changed = {d: self.degree_histogram.get(d, 0) for d in {du, dv, du + 1, dv + 1}}
+        self.emit({"type": "edge", "edge": (u, v), "degrees": changed, "merged": merged,
+                   "shifts": [(du, du + 1), (dv, dv + 1)], "triangles": len(common)})
+        return True
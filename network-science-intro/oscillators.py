@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class KuramotoModel:
+    def __init__(self, graph, coupling=1.0, frequencies=None, phases=None, seed=None,
+                 fps=60, substeps=2, chunk_size=600, normalize="degree"):
+        import networkx as nx
+
+        self.nodes = list(graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.adjacency = nx.to_scipy_sparse_array(graph, nodelist=self.nodes, format="csr", dtype=float)
+        n = len(self.nodes)
+        rng = np.random.default_rng(seed)
+
+        if normalize == "degree":
+            degree = np.asarray(self.adjacency.sum(axis=1)).ravel()
+            self.scale = coupling / np.maximum(degree, 1)
+        elif normalize == "size":
+            self.scale = np.full(n, coupling / max(n, 1))
+        else:
+            self.scale = np.full(n, float(coupling))
+
+        if frequencies is None:
+            frequencies = rng.normal(1.0, 0.1, n)
+        if phases is None:
+            phases = rng.uniform(0, 2 * np.pi, n)
+        self.frequencies = np.broadcast_to(np.asarray(frequencies, dtype=float), (n,)).copy()
+        self.initial_phases = np.broadcast_to(np.asarray(phases, dtype=float), (n,)).copy()
+
+        self.fps = fps
+        self.substeps = substeps
+        self.dt = 1 / (fps * substeps)
+        self.chunk_size = chunk_size
+        self.reset()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def reset(self):
+        self.theta = self.initial_phases.copy()
+        self.chunk_start = 0
+        self.chunk = self.theta[None, :].astype(np.float32)
+        self.order = [float(self.order_parameter(self.theta))]
+
+    def velocity(self, theta):
+        # sum_j A_ij sin(t_j - t_i) = cos(t_i) (A sin t)_i - sin(t_i) (A cos t)_i
+        sin, cos = np.sin(theta), np.cos(theta)
+        coupling = cos * (self.adjacency @ sin) - sin * (self.adjacency @ cos)
+        return self.frequencies + self.scale * coupling
+
+    def step(self, theta):
+        dt = self.dt
+        k1 = self.velocity(theta)
+        k2 = self.velocity(theta + dt / 2 * k1)
+        k3 = self.velocity(theta + dt / 2 * k2)
+        k4 = self.velocity(theta + dt * k3)
+        return theta + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    @staticmethod
+    def order_parameter(theta):
+        return np.abs(np.exp(1j * np.asarray(theta, dtype=float)).mean(axis=-1))
+
+    def compute_chunk(self):
+        frames = np.empty((self.chunk_size, len(self)), dtype=np.float32)
+        theta = self.theta
+        for i in range(self.chunk_size):
+            for _ in range(self.substeps):
+                theta = self.step(theta)
+            frames[i] = theta
+        self.theta = np.mod(theta, 2 * np.pi)
+        self.order.extend(self.order_parameter(frames).tolist())
+        return frames
+
+    def phases_at_frame(self, frame):
+        if frame < self.chunk_start:
+            self.reset()
+        while frame >= self.chunk_start + len(self.chunk):
+            self.chunk_start += len(self.chunk)
+            self.chunk = self.compute_chunk()
+        return self.chunk[frame - self.chunk_start]
+
+    def phases_at(self, t):
+        return self.phases_at_frame(int(round(t * self.fps)))
+
+    def order_at(self, t):
+        frame = int(round(t * self.fps))
+        self.phases_at_frame(frame)
+        return self.order[frame]
+
+    def order_history(self, t):
+        frame = int(round(t * self.fps))
+        self.phases_at_frame(frame)
+        return np.arange(frame + 1) / self.fps, np.asarray(self.order[:frame + 1])
+
+    def brightness_at(self, t):
+        return (1 + np.cos(self.phases_at(t))) / 2
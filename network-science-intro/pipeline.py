@@ -0,0 +1,160 @@
+import json
+import queue
+import threading
+import time
+import zlib
+
+import numpy as np
+from manim import VMobject, Wait, config, logger
+
+
+class FramePipeline:
+    def __init__(self, scene, buffers=4, detect_static=True):
+        if buffers < 2:
+            raise ValueError("the pipeline needs at least two frame buffers")
+        self.scene = scene
+        self.renderer = scene.renderer
+        self.buffers = buffers
+        self.detect_static = detect_static
+        self.ring = None
+        self.free = queue.Queue()
+        self.frames = queue.Queue()
+        self.pending = None
+        self.last_key = None
+        self.error = None
+        self.thread = threading.Thread(target=self.encode, name="frame-encoder", daemon=True)
+        self.stats = {"rasterized": 0, "repeated": 0, "spans": 0, "stall": 0.0, "encode": 0.0,
+                      "max_depth": 0, "depth_total": 0, "puts": 0}
+
+    def encode(self):
+        while True:
+            item = self.frames.get()
+            try:
+                if item is None:
+                    return
+                frame, count = item
+                start = time.perf_counter()
+                if self.error is None:
+                    try:
+                        for _ in range(count):
+                            self.renderer.file_writer.write_frame(frame)
+                    except Exception as error:
+                        self.error = error
+                self.stats["encode"] += time.perf_counter() - start
+                self.release(frame)
+            finally:
+                self.frames.task_done()
+
+    def release(self, frame):
+        if self.ring is not None and any(frame is buffer for buffer in self.ring):
+            self.free.put(frame)
+
+    def acquire(self, pixels):
+        if self.ring is None or self.ring[0].shape != pixels.shape:
+            self.ring = [np.empty_like(pixels) for _ in range(self.buffers)]
+            self.free = queue.Queue()
+            for buffer in self.ring:
+                self.free.put(buffer)
+        # Waiting here means the encoder is behind and every buffer is still queued
+        start = time.perf_counter()
+        buffer = self.free.get()
+        self.stats["stall"] += time.perf_counter() - start
+        np.copyto(buffer, pixels)
+        self.stats["rasterized"] += 1
+        return buffer
+
+    def add_frame(self, frame, num_frames=1):
+        # Only add_frame takes ring buffers, so everything taken is either held, queued or released;
+        # get_frame stays manim's own, since save_static_frame_data keeps its result as static_image
+        if self.renderer.skip_animations:
+            return
+        self.renderer.time += num_frames / self.renderer.camera.frame_rate
+        if self.pending is not None and self.pending[0] is frame:
+            self.pending[1] += num_frames
+            return
+        self.flush()
+        self.pending = [self.acquire(frame), num_frames]
+
+    def flush(self):
+        if self.pending is None:
+            return
+        if self.error is not None:
+            raise self.error
+        if self.pending[1] > 1:
+            self.stats["spans"] += 1
+            self.stats["repeated"] += self.pending[1] - 1
+        self.frames.put(tuple(self.pending))
+        depth = self.frames.qsize()
+        self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+        self.stats["depth_total"] += depth
+        self.stats["puts"] += 1
+        self.pending = None
+
+    @staticmethod
+    def state_key(mobjects):
+        # Cheap stand-in for "would this frame rasterize differently": checksum of everything Cairo reads
+        crc = 0
+        for mobject in mobjects:
+            for sub in mobject.family_members_with_points():
+                if not isinstance(sub, VMobject):
+                    return None
+                for array in (sub.points, sub.fill_rgbas, sub.stroke_rgbas, sub.background_stroke_rgbas):
+                    crc = zlib.crc32(np.ascontiguousarray(array), crc)
+                crc = zlib.crc32(repr((id(sub), sub.stroke_width, sub.background_stroke_width,
+                                       sub.z_index)).encode(), crc)
+        return crc
+
+    def render(self):
+        def wrapper(scene, time, moving_mobjects):
+            waiting = self.detect_static and scene.animations and all(
+                isinstance(animation, Wait) for animation in scene.animations)
+            key = self.state_key(moving_mobjects) if waiting else None
+            if key is not None and key == self.last_key and self.pending is not None:
+                # Updaters ran but changed nothing drawable: extend the held span instead of re-rasterizing
+                self.add_frame(self.pending[0])
+                return
+            # Same as CairoRenderer.render, minus get_frame's fresh copy: add_frame copies into the ring
+            self.renderer.update_frame(scene, moving_mobjects)
+            self.add_frame(self.renderer.camera.pixel_array)
+            self.last_key = key
+        return wrapper
+
+    def drain(self):
+        self.flush()
+        self.frames.join()
+        self.last_key = None
+        if self.error is not None:
+            raise self.error
+
+    def end_animation(self, function):
+        def wrapper(*args, **kwargs):
+            # A segment's frames must all reach its partial movie before the writer closes it
+            self.drain()
+            return function(*args, **kwargs)
+        return wrapper
+
+    def install(self):
+        renderer = self.renderer
+        renderer.add_frame = self.add_frame
+        renderer.render = self.render()
+        renderer.file_writer.end_animation = self.end_animation(renderer.file_writer.end_animation)
+        self.thread.start()
+        return self
+
+    def report(self):
+        stats = dict(self.stats)
+        stats["mean_depth"] = stats.pop("depth_total") / max(stats["puts"], 1)
+        return {"scene": type(self.scene).__name__, "buffers": self.buffers, **stats}
+
+    def close(self):
+        self.drain()
+        self.frames.put(None)
+        self.thread.join()
+        report = self.report()
+        directory = config.get_dir("media_dir") / "pipeline"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "{0}.json".format(report["scene"])).write_text(json.dumps(report, indent=1))
+        logger.info("pipeline: %d frames rasterized, %d repeated in %d spans, max queue depth %d, "
+                    "stalled %.2fs", report["rasterized"], report["repeated"], report["spans"],
+                    report["max_depth"], report["stall"])
+        return report
@@ -0,0 +1,132 @@
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+
+from manim import Arrow, Circle, Dot, Line, MathTex, Tex, Text, config, logger
+from manim.mobject.text import tex_mobject
+
+
+FAMILIES = (MathTex, Tex, Text, Arrow, Line, Dot, Circle)
+PHASES = ("construction", "latex", "interpolation", "rasterization", "encode")
+_tex_to_svg_file = tex_mobject.tex_to_svg_file
+
+
+class SceneProfiler:
+    def __init__(self, scene, allocations=False):
+        self.scene = scene
+        self.allocations = allocations
+        self.plays = []
+        self.current = None
+        self.families = defaultdict(float)
+        self.owner = {}
+        self.last_end = time.perf_counter()
+        self.pending_latex = 0.0
+
+    def timed(self, phase, function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if phase == "latex" and self.current is None:
+                    self.pending_latex += elapsed
+                elif self.current is not None:
+                    self.current[phase] += elapsed
+        return wrapper
+
+    def label_families(self):
+        # Outermost recognised family wins, so a MathTex's glyph paths are billed to MathTex
+        self.owner = {}
+
+        def walk(mob, label):
+            if label is None and isinstance(mob, FAMILIES):
+                label = type(mob).__name__
+            self.owner[id(mob)] = label or type(mob).__name__
+            for sub in mob.submobjects:
+                walk(sub, label)
+
+        for mob in self.scene.mobjects:
+            walk(mob, None)
+
+    def display_vectorized(self, function):
+        def wrapper(vmobject, ctx):
+            start = time.perf_counter()
+            result = function(vmobject, ctx)
+            self.families[self.owner.get(id(vmobject), type(vmobject).__name__)] += time.perf_counter() - start
+            return result
+        return wrapper
+
+    def begin_animations(self, function):
+        def wrapper(*args, **kwargs):
+            result = function(*args, **kwargs)
+            # Only now are this play's new mobjects (Write/FadeIn/Create targets) in scene.mobjects
+            self.label_families()
+            return result
+        return wrapper
+
+    def play(self, function):
+        def wrapper(scene, *args, **kwargs):
+            start = time.perf_counter()
+            self.current = {phase: 0.0 for phase in PHASES}
+            self.current["construction"] = start - self.last_end - self.pending_latex
+            self.current["latex"] = self.pending_latex
+            self.pending_latex = 0.0
+            if self.allocations:
+                tracemalloc.start()
+            try:
+                return function(scene, *args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                record = self.current
+                record["index"] = len(self.plays)
+                record["animations"] = [type(animation).__name__ for animation in scene.animations or []]
+                record["duration"] = scene.duration
+                record["play_wall"] = end - start
+                record["other"] = max(0.0, record["play_wall"] - record["interpolation"]
+                                      - record["rasterization"] - record["encode"])
+                if self.allocations:
+                    current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    record["alloc_current"], record["alloc_peak"] = current, peak
+                self.plays.append(record)
+                self.current = None
+                self.last_end = time.perf_counter()
+
+        return wrapper
+
+    def install(self):
+        scene, renderer = self.scene, self.scene.renderer
+        scene.update_to_time = self.timed("interpolation", scene.update_to_time)
+        scene.begin_animations = self.begin_animations(scene.begin_animations)
+        renderer.camera.capture_mobjects = self.timed("rasterization", renderer.camera.capture_mobjects)
+        renderer.camera.display_vectorized = self.display_vectorized(renderer.camera.display_vectorized)
+        renderer.file_writer.write_frame = self.timed("encode", renderer.file_writer.write_frame)
+        renderer.play = self.play(renderer.play)
+        tex_mobject.tex_to_svg_file = self.timed("latex", _tex_to_svg_file)
+        return self
+
+    def report(self):
+        totals = {phase: sum(play[phase] for play in self.plays) for phase in PHASES + ("other",)}
+        return {"scene": type(self.scene).__name__, "quality": config.quality, "totals": totals,
+                "families": dict(sorted(self.families.items(), key=lambda item: -item[1])),
+                "plays": self.plays}
+
+    def save(self):
+        directory = config.get_dir("media_dir") / "profiles"
+        directory.mkdir(parents=True, exist_ok=True)
+        name = type(self.scene).__name__
+        report = self.report()
+        (directory / "{0}.json".format(name)).write_text(json.dumps(report, indent=1))
+        # Collapsed stacks (flamegraph.pl / speedscope), in microseconds
+        lines = []
+        for play in self.plays:
+            frame = "{0};play_{1:04d}".format(name, play["index"])
+            for phase in PHASES + ("other",):
+                if play[phase] > 0:
+                    lines.append("{0};{1} {2}".format(frame, phase, int(play[phase] * 1e6)))
+        for family, seconds in report["families"].items():
+            lines.append("{0};draw;{1} {2}".format(name, family, int(seconds * 1e6)))
+        (directory / "{0}.folded".format(name)).write_text("\n".join(lines) + "\n")
+        logger.info("profile written to %s", directory / "{0}.json".format(name))
@@ -0,0 +1,229 @@
+import argparse
+import importlib
+import inspect
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from atomic_io import atomic_write
+
+
+HERE = Path(__file__).resolve().parent
+QUALITY_DIRS = {"l": "480p15", "m": "720p30", "h": "1080p60", "p": "1440p60", "k": "2160p60"}
+STILL_SCENES = {"Thumbnail"}
+
+
+def discover_scenes(module_name="main"):
+    from manim import Scene
+
+    sys.path.insert(0, str(HERE))
+    module = importlib.import_module(module_name)
+    scenes = [obj for _, obj in inspect.getmembers(module, inspect.isclass)
+              if issubclass(obj, Scene) and obj.__module__ == module.__name__
+              and obj.construct is not Scene.construct]
+    return [scene.__name__ for scene in sorted(scenes, key=lambda obj: inspect.getsourcelines(obj)[1])]
+
+
+def scene_output(scene, quality="h", media_dir="media", module_name="main"):
+    return HERE / media_dir / "videos" / module_name / QUALITY_DIRS[quality] / "{0}.mp4".format(scene)
+
+
+def manim_command(scene, quality="h", media_dir="media", module_name="main", extra=()):
+    command = [sys.executable, "-m", "manim", "render", "-q" + quality, "--media_dir", media_dir]
+    if scene in STILL_SCENES:
+        command.append("-s")
+    return command + list(extra) + ["{0}.py".format(module_name), scene]
+
+
+def render_scene(scene, quality="h", media_dir="media", log_dir="logs", module_name="main", extra=(), env=None):
+    log_path = HERE / log_dir / "{0}.log".format(scene)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    with open(log_path, "w") as log:
+        process = subprocess.run(manim_command(scene, quality, media_dir, module_name, extra), cwd=HERE,
+                                 stdout=log, stderr=subprocess.STDOUT, env=env)
+    return {
+        "scene": scene,
+        "returncode": process.returncode,
+        "seconds": round(time.perf_counter() - start, 3),
+        "log": str(log_path),
+        "output": None if scene in STILL_SCENES else str(scene_output(scene, quality, media_dir, module_name)),
+    }
+
+
+def scene_class(scene, module_name="main"):
+    sys.path.insert(0, str(HERE))
+    return getattr(importlib.import_module(module_name), scene)
+
+
+def clip_key(scene, quality="h", module_name="main"):
+    import manim
+
+    cls = scene_class(scene, module_name)
+    sources = [inspect.getsource(klass) for klass in cls.__mro__ if klass.__module__ == cls.__module__]
+    digest = hashlib.sha1(repr([manim.__version__, quality, sources]).encode()).hexdigest()
+    return "{0}-{1}".format(scene, digest[:16])
+
+
+def render_branded(scene, quality="h", clip_dir=None, **kwargs):
+    # Branding clips only change with their source, so one render per quality serves every episode
+    clip_dir = Path(clip_dir or os.environ.get("BRANDING_CLIP_DIR", HERE / "clips")) / QUALITY_DIRS[quality]
+    clip = clip_dir / "{0}.mp4".format(clip_key(scene, quality, kwargs.get("module_name", "main")))
+    if clip.exists():
+        return {"scene": scene, "returncode": 0, "seconds": 0.0, "log": None, "output": str(clip), "cached": True}
+    result = render_scene(scene, quality, **kwargs)
+    if result["returncode"] == 0:
+        with open(result["output"], "rb") as source, atomic_write(clip) as f:
+            shutil.copyfileobj(source, f)
+        result["output"] = str(clip)
+    return result
+
+
+def render_job(scene, **kwargs):
+    if getattr(scene_class(scene, kwargs.get("module_name", "main")), "branded", False):
+        return render_branded(scene, **kwargs)
+    return render_scene(scene, **kwargs)
+
+
+def render_scenes(scenes, jobs=None, **kwargs):
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    # Each job is its own manim process, so threads here only wait on subprocesses
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(render_job, scene, **kwargs): scene for scene in scenes}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["scene"]] = result
+            status = "ok" if result["returncode"] == 0 else "FAILED ({0})".format(result["log"])
+            if result.get("cached"):
+                status = "reused " + result["output"]
+            print("{0:<20} {1:>8.1f}s  {2}".format(result["scene"], result["seconds"], status), flush=True)
+    return [results[scene] for scene in scenes]
+
+
+def plan_scene(scene, quality="h", module_name="main"):
+    from manim import tempconfig
+
+    cls = scene_class(scene, module_name)
+    durations = []
+
+    def recording_play(self, *args, **kwargs):
+        cls.play(self, *args, **kwargs)
+        durations.append(self.duration)
+
+    # Fast-forward pass, the same skipping the -n workers use for plays outside their range: construct()
+    # runs and every play jumps to its end state without rasterizing frames; dry_run keeps files out of it
+    recorder = type(scene, (cls,), {"play": recording_play})
+    with tempconfig({"dry_run": True, "quality": manim_quality(quality), "disable_caching": True}):
+        recorder(skip_animations=True).render()
+    return durations
+
+
+def manim_quality(quality):
+    return {"l": "low_quality", "m": "medium_quality", "h": "high_quality",
+            "p": "production_quality", "k": "fourk_quality"}[quality]
+
+
+def split_plays(durations, parts):
+    cumulative = np.cumsum(durations)
+    total = cumulative[-1] if len(cumulative) else 0
+    cuts = sorted({int(np.searchsorted(cumulative, total * k / parts)) for k in range(1, parts)})
+    ranges, start = [], 0
+    for cut in cuts + [len(durations) - 1]:
+        if cut >= start:
+            ranges.append((start, cut))
+            start = cut + 1
+    return ranges
+
+
+def render_split(scene, parts=None, quality="h", media_dir="media", log_dir="logs", module_name="main", env=None):
+    parts = parts or os.cpu_count() or 1
+    ranges = split_plays(plan_scene(scene, quality, module_name), parts)
+
+    def render_part(i):
+        # Separate media dirs keep each worker's partial movie cache cleanup away from the others
+        part = "parts/{0}/{1:03d}".format(scene, i)
+        return render_scene(scene, quality, "{0}/{1}".format(media_dir, part), "{0}/{1}".format(log_dir, part),
+                            module_name, extra=["-n", "{0},{1}".format(*ranges[i])], env=env)
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        results = list(pool.map(render_part, range(len(ranges))))
+    seconds = max(result["seconds"] for result in results)
+    failed = [result["log"] for result in results if result["returncode"] != 0]
+    print("{0:<20} {1:>8.1f}s  {2} parts{3}".format(scene, seconds, len(ranges),
+                                                     "  FAILED " + ", ".join(failed) if failed else ""), flush=True)
+    output = scene_output(scene, quality, media_dir, module_name)
+    if not failed:
+        concat_videos([result["output"] for result in results], output)
+    return {"scene": scene, "returncode": 1 if failed else 0, "seconds": seconds, "parts": results,
+            "log": str(HERE / log_dir / "parts" / scene), "output": str(output)}
+
+
+def concat_videos(paths, output):
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    list_path = output.with_suffix(".txt")
+    with open(list_path, "w") as listing:
+        for path in paths:
+            listing.write("file '{0}'\n".format(Path(path).resolve()))
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                    "-i", str(list_path), "-c", "copy", str(output)], check=True)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every scene of main.py in parallel")
+    parser.add_argument("scenes", nargs="*", help="scenes to render (default: all)")
+    parser.add_argument("-q", "--quality", default="h", choices=sorted(QUALITY_DIRS))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--title", help="title for the Thumbnail scene")
+    parser.add_argument("-o", "--output", default="episode.mp4")
+    parser.add_argument("--no-concat", action="store_true")
+    parser.add_argument("--split", nargs="*", metavar="SCENE", default=[],
+                        help="scenes to render in parallel segment ranges")
+    parser.add_argument("--parts", type=int, help="segment ranges per split scene (default: cores)")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.title is not None:
+        env["THUMBNAIL_TITLE"] = args.title
+
+    scenes = args.scenes or discover_scenes()
+    split = [scene for scene in scenes if scene in args.split]
+    results = render_scenes([scene for scene in scenes if scene not in split], jobs=args.jobs,
+                            quality=args.quality, media_dir=args.media_dir, log_dir=args.log_dir, env=env)
+    for scene in split:
+        results.append(render_split(scene, args.parts, quality=args.quality, media_dir=args.media_dir,
+                                    log_dir=args.log_dir, env=env))
+    with open(HERE / args.log_dir / "timings.json", "w") as timings:
+        json.dump(results, timings, indent=2)
+
+    failed = [result["scene"] for result in results if result["returncode"] != 0]
+    if failed:
+        print("failed: " + ", ".join(failed))
+        return 1
+    if not args.no_concat:
+        from main import EPISODE
+
+        outputs = {result["scene"]: result["output"] for result in results}
+        missing = [scene for scene in EPISODE if scene not in outputs]
+        if missing:
+            print("not concatenating, episode scenes not rendered: " + ", ".join(missing))
+        else:
+            print("episode: {0}".format(concat_videos([outputs[scene] for scene in EPISODE],
+                                                      HERE / args.media_dir / args.output)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
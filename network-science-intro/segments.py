@@ -0,0 +1,150 @@
+import hashlib
+import inspect
+import json
+import weakref
+from types import FunctionType, MethodType, ModuleType
+
+import numpy as np
+from manim import Mobject, Scene, config, logger
+from manim.renderer import cairo_renderer
+
+
+_fingerprinted = weakref.WeakKeyDictionary()
+_original_hash = cairo_renderer.get_hash_from_play_call
+
+
+def visible(mob):
+    rgbas = [getattr(mob, name) for name in ("fill_rgbas", "stroke_rgbas") if hasattr(mob, name)]
+    return not rgbas or any(np.any(rgba[:, 3] > 0) for rgba in rgbas)
+
+
+def value_state(value, digest, seen, depth=4):
+    # Updater inputs: literals by value, arrays by content, containers and plain objects recursively
+    if isinstance(value, (int, float, str, bool, complex)) or value is None:
+        digest.update(repr(value).encode())
+        return
+    if isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+        return
+    if id(value) in seen or depth == 0 or isinstance(value, (ModuleType, type, Scene)):
+        digest.update(getattr(value, "__qualname__", type(value).__name__).encode())
+        return
+    seen.add(id(value))
+    if isinstance(value, Mobject):
+        mobject_state(value, digest, seen)
+    elif isinstance(value, (MethodType, FunctionType)):
+        function_state(value, digest, seen, depth - 1)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            digest.update(repr(key).encode())
+            value_state(item, digest, seen, depth - 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            value_state(item, digest, seen, depth - 1)
+    else:
+        digest.update(type(value).__name__.encode())
+        for name, item in sorted(getattr(value, "__dict__", {}).items()):
+            digest.update(name.encode())
+            value_state(item, digest, seen, depth - 1)
+
+
+def function_state(function, digest, seen, depth=4):
+    # Like manim's own hasher: the code plus the globals and closure values it reads
+    digest.update(getattr(function, "__qualname__", repr(function)).encode())
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return
+    digest.update(code.co_code)
+    digest.update(repr([const for const in code.co_consts if not inspect.iscode(const)]).encode())
+    closure = inspect.getclosurevars(function)
+    for name, value in sorted({**closure.globals, **closure.nonlocals}.items()):
+        if not isinstance(value, ModuleType):
+            digest.update(name.encode())
+            value_state(value, digest, seen, depth)
+
+
+def mobject_state(mobject, digest, seen=None):
+    # Only what ends up in pixels: geometry and colour of every visible family member
+    seen = set() if seen is None else seen
+    seen.add(id(mobject))
+    for mob in mobject.family_members_with_points():
+        if not visible(mob):
+            continue
+        digest.update(type(mob).__name__.encode())
+        for name in ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+            if hasattr(mob, name):
+                digest.update(np.ascontiguousarray(getattr(mob, name), dtype=float).tobytes())
+        if hasattr(mob, "stroke_width"):
+            digest.update(repr(mob.stroke_width).encode())
+    for mob in mobject.get_family():
+        for updater in mob.get_updaters():
+            function_state(updater, digest, seen)
+
+
+def animation_state(animation, digest, touched):
+    digest.update(type(animation).__name__.encode())
+    for name, value in sorted(vars(animation).items()):
+        if isinstance(value, Mobject):
+            mobject_state(value, digest)
+            touched.add(type(value).__name__)
+        elif isinstance(value, (int, float, str, bool)) or value is None:
+            digest.update("{0}={1!r}".format(name, value).encode())
+        elif callable(value):
+            digest.update("{0}={1}".format(name, getattr(value, "__qualname__", type(value).__name__)).encode())
+        elif isinstance(value, (list, tuple)) and value and all(hasattr(v, "interpolate") for v in value):
+            for sub in value:
+                animation_state(sub, digest, touched)
+
+
+def segment_fingerprint(scene, camera, animations, current_mobjects):
+    tracker = _fingerprinted.get(scene.renderer)
+    if tracker is None:
+        return _original_hash(scene, camera, animations, current_mobjects)
+
+    camera_digest = hashlib.sha1(repr([config.pixel_width, config.pixel_height, config.frame_rate,
+                                       str(camera.background_color)]).encode())
+    animation_digest = hashlib.sha1()
+    touched = set()
+    for animation in animations:
+        animation_state(animation, animation_digest, touched)
+    scene_digest = hashlib.sha1()
+    for mobject in current_mobjects:
+        mobject_state(mobject, scene_digest)
+        if mobject.get_family_updaters():
+            touched.add(type(mobject).__name__)
+    fingerprint = "{0}_{1}_{2}".format(camera_digest.hexdigest()[:10], animation_digest.hexdigest()[:16],
+                                       scene_digest.hexdigest()[:16])
+    tracker.record(fingerprint, sorted(touched))
+    return fingerprint
+
+
+class SegmentTracker:
+    def __init__(self, scene):
+        self.manifest = config.get_dir("media_dir") / "segments" / "{0}.json".format(type(scene).__name__)
+        try:
+            self.previous = json.loads(self.manifest.read_text())
+        except (OSError, ValueError):
+            self.previous = []
+        self.segments = []
+
+    def record(self, fingerprint, touched):
+        index = len(self.segments)
+        previous = self.previous[index]["fingerprint"] if index < len(self.previous) else None
+        self.segments.append({"fingerprint": fingerprint, "touched": touched, "dirty": fingerprint != previous})
+
+    def save(self):
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest.write_text(json.dumps(self.segments, indent=1))
+        dirty = [i for i, segment in enumerate(self.segments) if segment["dirty"]]
+        logger.info("%d of %d segments changed since the last run: %s", len(dirty), len(self.segments), dirty)
+
+
+def enable_segment_fingerprints(scene):
+    # Partial movies are named by a fingerprint of the segment's own inputs (visible state at its
+    # start plus its animations), so unaffected segments hit manim's existing partial movie cache
+    cairo_renderer.get_hash_from_play_call = segment_fingerprint
+    config.max_files_cached = max(config.max_files_cached, 1000)
+    tracker = SegmentTracker(scene)
+    _fingerprinted[scene.renderer] = tracker
+    return tracker
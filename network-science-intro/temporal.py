@@ -0,0 +1,120 @@
+import csv
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from layout import relax
+
+
+EDGE_DTYPE = np.dtype([("t", "<f8"), ("u", "<i8"), ("v", "<i8")])
+
+
+class EdgeStream:
+    def __init__(self, path, chunk_size=65536):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        if self.path.suffix == ".csv":
+            self.file = open(self.path, newline="")
+            self.rows = csv.reader(self.file)
+            self.pending = None
+            self.log = None
+            for row in self.rows:
+                try:
+                    self.pending = (float(row[0]), int(row[1]), int(row[2]))
+                    break
+                except ValueError:
+                    continue
+            self.start_time = self.pending[0] if self.pending else 0.0
+        else:
+            # Memory-mapped: only the pages holding the requested time range are ever read
+            if self.path.suffix == ".npy":
+                self.log = np.load(self.path, mmap_mode="r")
+            else:
+                self.log = np.memmap(self.path, dtype=EDGE_DTYPE, mode="r")
+            self.position = 0
+            self.start_time = float(self.log["t"][0]) if len(self.log) else 0.0
+
+    def read_until(self, time):
+        if self.log is not None:
+            end = self.position + int(np.searchsorted(self.log["t"][self.position:], time, side="right"))
+            while self.position < end:
+                stop = min(end, self.position + self.chunk_size)
+                chunk = self.log[self.position:stop]
+                self.position = stop
+                yield from zip(chunk["t"].tolist(), chunk["u"].tolist(), chunk["v"].tolist())
+            return
+        while self.pending is not None and self.pending[0] <= time:
+            yield self.pending
+            row = next(self.rows, None)
+            self.pending = (float(row[0]), int(row[1]), int(row[2])) if row else None
+
+    def close(self):
+        if self.log is None:
+            self.file.close()
+
+
+class SlidingWindow:
+    def __init__(self, width):
+        self.width = width
+        self.last_seen = {}
+        self.queue = deque()
+        self.degree = {}
+
+    def __len__(self):
+        return len(self.last_seen)
+
+    def add(self, t, u, v):
+        if u == v:
+            return
+        key = (u, v) if u < v else (v, u)
+        if key not in self.last_seen:
+            self.degree[u] = self.degree.get(u, 0) + 1
+            self.degree[v] = self.degree.get(v, 0) + 1
+        self.last_seen[key] = t
+        self.queue.append((t, key))
+
+    def expire(self, now):
+        # Edges arrive in time order, so expired contacts are always at the head of the queue
+        cutoff = now - self.width
+        removed = []
+        while self.queue and self.queue[0][0] < cutoff:
+            t, key = self.queue.popleft()
+            if self.last_seen.get(key) == t:
+                del self.last_seen[key]
+                for node in key:
+                    self.degree[node] -= 1
+                    if not self.degree[node]:
+                        del self.degree[node]
+                removed.append(key)
+        return removed
+
+
+class IncrementalLayout:
+    def __init__(self, seed=0, iterations=3, temperature=0.02):
+        self.rng = np.random.default_rng(seed)
+        self.iterations = iterations
+        self.temperature = temperature
+        self.positions = {}
+
+    def update(self, window):
+        nodes = list(window.degree)
+        for node in list(self.positions):
+            if node not in window.degree:
+                del self.positions[node]
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = np.array([(index[u], index[v]) for u, v in window.last_seen], dtype=np.int64).reshape(-1, 2)
+        k = 1 / np.sqrt(max(len(nodes), 1))
+        for u, v in edges:
+            for a, b in ((nodes[u], nodes[v]), (nodes[v], nodes[u])):
+                if a not in self.positions and b in self.positions:
+                    self.positions[a] = self.positions[b] + self.rng.normal(0, k / 4, 2)
+        for node in nodes:
+            if node not in self.positions:
+                self.positions[node] = self.rng.uniform(-0.5, 0.5, 2)
+        positions = np.array([self.positions[node] for node in nodes]).reshape(-1, 2)
+        if len(nodes) > 1:
+            positions = np.clip(relax(positions, edges, k, self.iterations, self.temperature), -1, 1)
+        for node, position in zip(nodes, positions):
+            self.positions[node] = position
+        return nodes, positions, edges
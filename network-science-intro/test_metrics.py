@@ -0,0 +1,31 @@
+import networkx as nx
+import numpy as np
+
+import metrics
+from metrics import GraphMetrics
+
+
+def test_distances_through_high_degree_hub():
+    # 0 - {1..256} - 257: node 257 is reached by 256 frontier nodes at once
+    edges = [(0, i) for i in range(1, 257)] + [(i, 257) for i in range(1, 257)]
+    metrics = GraphMetrics(258, edges)
+    assert metrics.distances_from([0])[0][257] == 2
+
+
+def test_path_stats_match_networkx():
+    for graph in (nx.star_graph(300), nx.connected_watts_strogatz_graph(200, 6, 0.1, seed=1),
+                  nx.barabasi_albert_graph(300, 2, seed=2)):
+        metrics = GraphMetrics.from_networkx(graph)
+        assert np.isclose(metrics.average_path_length(), nx.average_shortest_path_length(graph))
+        assert metrics.diameter() == nx.diameter(graph)
+
+
+def test_cache_keeps_labels_per_call_and_stays_bounded():
+    edges = [(0, 1), (1, 2)]
+    first = GraphMetrics.cached(3, edges, ["a", "b", "c"])
+    second = GraphMetrics.cached(3, edges, ["x", "y", "z"])
+    assert first.labels == ["a", "b", "c"] and second.labels == ["x", "y", "z"]
+    assert first.adjacency is second.adjacency
+    for n in range(3, 3 + 2 * metrics.METRICS_CACHE_SIZE):
+        GraphMetrics.cached(n, [(i, i + 1) for i in range(n - 1)])
+    assert len(metrics._metrics_cache) == metrics.METRICS_CACHE_SIZE
@@ -0,0 +1,84 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+
+HERE = Path(__file__).resolve().parent
+_worker = {}
+
+
+def read_items(path):
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        items = json.loads(path.read_text(encoding="utf-8"))
+        items = [{"title": item} if isinstance(item, str) else item for item in items]
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            items = list(csv.DictReader(f))
+    for i, item in enumerate(items):
+        item.setdefault("name", None)
+        if not item["name"]:
+            slug = re.sub(r"[^\w-]+", "-", item["title"].lower()).strip("-")
+            item["name"] = "{0:04d}-{1}".format(i, slug[:48])
+    return items
+
+
+def init_worker(quality):
+    sys.path.insert(0, str(HERE))
+    from manim import WHITE, Camera, config
+    from main import Thumbnail
+    from render import manim_quality
+
+    config.quality = manim_quality(quality)
+    camera = Camera(background_color=WHITE)
+    # The nabla background is rasterized once per worker; each title only draws its Text on a copy
+    camera.capture_mobjects(list(Thumbnail.background()))
+    _worker["camera"] = camera
+    _worker["background"] = camera.pixel_array.copy()
+
+
+def render_item(item, output_dir):
+    from main import Thumbnail
+
+    start = time.perf_counter()
+    camera = _worker["camera"]
+    camera.set_pixel_array(_worker["background"].copy())
+    camera.capture_mobjects([Thumbnail.title_text(item["title"])])
+    path = Path(output_dir) / "{0}.png".format(item["name"])
+    camera.get_image().save(path)
+    return str(path), time.perf_counter() - start
+
+
+def render_thumbnails(items, output_dir, jobs=None, quality="h"):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = min(jobs or os.cpu_count() or 1, max(len(items), 1))
+    with Pool(jobs, initializer=init_worker, initargs=(quality,)) as pool:
+        results = pool.starmap(render_item, [(item, output_dir) for item in items],
+                               chunksize=max(1, len(items) // (jobs * 4)))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one PNG thumbnail per title")
+    parser.add_argument("titles", help="CSV with a 'title' column (optional 'name') or a JSON list")
+    parser.add_argument("-o", "--output-dir", default=str(HERE / "media" / "thumbnails"))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("-q", "--quality", default="h", choices=["l", "m", "h", "p", "k"])
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = render_thumbnails(read_items(args.titles), args.output_dir, args.jobs, args.quality)
+    for path, seconds in results:
+        print("{0:>6.2f}s  {1}".format(seconds, path))
+    print("{0} thumbnails in {1:.1f}s".format(len(results), time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+def reset_marks(graph):
+    for node in graph:
+        node.marked = False
+        node.prev = None
+
+
+def node_index(graph):
+    return {id(node): i for i, node in enumerate(graph)}
+
+
+def bfs(graph, source):
+    index = node_index(graph)
+    reset_marks(graph)
+    graph[source].marked = True
+    events = [("visit", source, None)]
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for other in graph[u].neighbors:
+            if not other.marked:
+                other.marked = True
+                other.prev = graph[u]
+                v = index[id(other)]
+                events.append(("visit", v, u))
+                queue.append(v)
+    return events
+
+
+def dfs(graph, source):
+    index = node_index(graph)
+    reset_marks(graph)
+    graph[source].marked = True
+    events = [("visit", source, None)]
+    stack = [(source, iter(graph[source].neighbors))]
+    while stack:
+        u, neighbors = stack[-1]
+        for other in neighbors:
+            if not other.marked:
+                other.marked = True
+                other.prev = graph[u]
+                v = index[id(other)]
+                events.append(("visit", v, u))
+                stack.append((v, iter(other.neighbors)))
+                break
+        else:
+            stack.pop()
+    return events
+
+
+def dijkstra(graph, source, weight=None):
+    index = node_index(graph)
+    reset_marks(graph)
+    if weight is None:
+        def weight(u, v):
+            return float(np.linalg.norm(np.asarray(graph[u].center) - np.asarray(graph[v].center)))
+
+    dist = {source: 0.0}
+    events = []
+    heap = [(0.0, source, -1)]
+    while heap:
+        d, u, prev = heapq.heappop(heap)
+        if graph[u].marked:
+            continue
+        graph[u].marked = True
+        if prev >= 0:
+            graph[u].prev = graph[prev]
+        events.append(("visit", u, prev if prev >= 0 else None))
+        for other in graph[u].neighbors:
+            v = index[id(other)]
+            if other.marked:
+                continue
+            nd = d + weight(u, v)
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                events.append(("relax", u, v, nd))
+                heapq.heappush(heap, (nd, v, u))
+    return events